@@ -1,4 +1,5 @@
 from django.contrib.auth.models import User
+from django.db.models import Q
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
@@ -20,12 +21,18 @@ def register(request):
             status=status.HTTP_400_BAD_REQUEST,
         )
 
-    if User.objects.filter(username=username).exists():
-        return Response(
-            {"error": "Username already exists"}, status=status.HTTP_400_BAD_REQUEST
+    # Look up username and email clashes in a single query
+    clashes = set(
+        User.objects.filter(Q(username=username) | Q(email=email)).values_list(
+            "username", flat=True
         )
-
-    if User.objects.filter(email=email).exists():
+    )
+    if clashes:
+        if username in clashes:
+            return Response(
+                {"error": "Username already exists"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
         return Response(
             {"error": "Email already exists"}, status=status.HTTP_400_BAD_REQUEST
         )
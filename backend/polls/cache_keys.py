@@ -0,0 +1,50 @@
+"""
+Cache keys shared by the polls views and Celery tasks.
+
+Kept free of DRF and view imports so workers can bump cache versions without
+loading the API layer.
+"""
+
+import time
+
+from django.core.cache import cache
+
+POLL_LIST_VERSION_KEY = "poll-list-version"
+
+
+def results_cache_keys(poll_id):
+    """Return the (fresh, stale) cache keys for a poll's (etag, results)."""
+    return f"poll-results:v2:{poll_id}", f"poll-results-stale:v2:{poll_id}"
+
+
+def voted_key(poll_id, voter_ip):
+    """Return the cache key marking that ``voter_ip`` voted in a poll."""
+    return f"voted:{poll_id}:{voter_ip}"
+
+
+def poll_list_version():
+    """Return the current poll list version, starting one if there is none."""
+    version = cache.get(POLL_LIST_VERSION_KEY)
+    if version is None:
+        # A clock-based start keeps a flushed cache from reusing old versions
+        cache.add(POLL_LIST_VERSION_KEY, time.time_ns(), None)
+        version = cache.get(POLL_LIST_VERSION_KEY, 0)
+    return version
+
+
+def touch_poll_list():
+    """Move the poll list to a new version, changing its ETag."""
+    try:
+        cache.incr(POLL_LIST_VERSION_KEY)
+    except ValueError:
+        poll_list_version()
+
+
+def invalidate_poll_results(poll_id):
+    """
+    Drop the cached results of a poll after its votes or options change.
+
+    The poll list shows the same vote counts, so its ETag is moved on too.
+    """
+    cache.delete(results_cache_keys(poll_id)[0])
+    touch_poll_list()
@@ -2,14 +2,18 @@
 Management command to test JWT authentication and rate limiting functionality.
 """
 
-import json
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
 from django.conf import settings
 from django.contrib.auth.models import User
 from django.core.management.base import BaseCommand
 
+# Concurrent requests per burst; each worker thread has its own session
+BURST_WORKERS = 10
+
 
 class Command(BaseCommand):
     help = "Test JWT authentication and rate limiting functionality"
@@ -53,18 +57,22 @@ class Command(BaseCommand):
         # Step 1: Create test user if doesn't exist
         self.create_test_user(username, email, password)
 
-        # Step 2: Test JWT token authentication
-        access_token = self.test_jwt_auth(host, username, password)
+        # Reuse one pooled connection for every request made below
+        with requests.Session() as session:
+            self.session = session
+
+            # Step 2: Test JWT token authentication
+            access_token = self.test_jwt_auth(host, username, password)
 
-        if access_token:
-            # Step 3: Test authenticated poll creation with rate limiting
-            self.test_poll_creation_rate_limit(host, access_token)
+            if access_token:
+                # Step 3: Test authenticated poll creation with rate limiting
+                self.test_poll_creation_rate_limit(host, access_token)
 
-            # Step 4: Test voting rate limiting
-            self.test_voting_rate_limit(host)
+                # Step 4: Test voting rate limiting
+                self.test_voting_rate_limit(host)
 
-            # Step 5: Test token refresh
-            self.test_token_refresh(host, username, password)
+                # Step 5: Test token refresh
+                self.test_token_refresh(host, username, password)
 
         self.stdout.write(
             self.style.SUCCESS(
@@ -101,9 +109,9 @@ class Command(BaseCommand):
 
         try:
             # Get JWT token
-            response = requests.post(
+            response = self.session.post(
                 f"{host}/api/auth/token/",
-                data={"username": username, "password": password},
+                json={"username": username, "password": password},
             )
 
             if response.status_code == 200:
@@ -120,8 +128,8 @@ class Command(BaseCommand):
                 )
 
                 # Verify token
-                verify_response = requests.post(
-                    f"{host}/api/auth/token/verify/", data={"token": access_token}
+                verify_response = self.session.post(
+                    f"{host}/api/auth/token/verify/", json={"token": access_token}
                 )
 
                 if verify_response.status_code == 200:
@@ -152,47 +160,47 @@ class Command(BaseCommand):
         """Test poll creation rate limiting (5 per hour)."""
         self.stdout.write("\n--- Testing Poll Creation Rate Limiting ---")
 
-        headers = {
-            "Authorization": f"Bearer {access_token}",
-            "Content-Type": "application/json",
-        }
+        headers = {"Authorization": f"Bearer {access_token}"}
 
-        # Try creating multiple polls to test rate limiting
-        for i in range(7):  # Try 7 polls (should hit limit at 6th)
-            poll_data = {
+        # Try creating 7 polls at once (should hit limit at 6th)
+        payloads = [
+            {
                 "title": f"Test Poll {i+1} - {int(time.time())}",
                 "description": f"This is test poll number {i+1}",
                 "options": [f"Option A {i+1}", f"Option B {i+1}", f"Option C {i+1}"],
                 "is_active": True,
             }
+            for i in range(7)
+        ]
+
+        responses = self.send_burst(
+            lambda session, poll_data: session.post(
+                f"{host}/api/polls/", headers=headers, json=poll_data
+            ),
+            payloads,
+        )
 
-            try:
-                response = requests.post(
-                    f"{host}/api/polls/", headers=headers, data=json.dumps(poll_data)
+        for i, response in enumerate(responses):
+            if isinstance(response, Exception):
+                self.stdout.write(
+                    self.style.ERROR(f"✗ Error creating poll {i+1}: {response}")
                 )
-
-                if response.status_code == 201:
-                    self.stdout.write(
-                        self.style.SUCCESS(f"✓ Poll {i+1} created successfully")
-                    )
-                elif response.status_code == 429:
-                    self.stdout.write(
-                        self.style.WARNING(
-                            f"⚠ Poll {i+1} blocked by rate limit (429) - This is expected!"
-                        )
+            elif response.status_code == 201:
+                self.stdout.write(
+                    self.style.SUCCESS(f"✓ Poll {i+1} created successfully")
+                )
+            elif response.status_code == 429:
+                self.stdout.write(
+                    self.style.WARNING(
+                        f"⚠ Poll {i+1} blocked by rate limit (429) - This is expected!"
                     )
-                    break
-                else:
-                    self.stdout.write(
-                        self.style.ERROR(
-                            f"✗ Poll {i+1} creation failed: {response.status_code} - {response.text}"
-                        )
+                )
+            else:
+                self.stdout.write(
+                    self.style.ERROR(
+                        f"✗ Poll {i+1} creation failed: {response.status_code} - {response.text}"
                     )
-            except Exception as e:
-                self.stdout.write(self.style.ERROR(f"✗ Error creating poll {i+1}: {e}"))
-
-            # Small delay between requests
-            time.sleep(0.1)
+                )
 
     def test_voting_rate_limit(self, host):
         """Test voting rate limiting (10 per minute)."""
@@ -200,7 +208,7 @@ class Command(BaseCommand):
 
         try:
             # First, get a poll to vote on
-            response = requests.get(f"{host}/api/polls/")
+            response = self.session.get(f"{host}/api/polls/")
             if response.status_code == 200:
                 polls = response.json()
                 if polls:
@@ -209,55 +217,52 @@ class Command(BaseCommand):
 
                     self.stdout.write(f"Testing votes on poll {poll_id}")
 
-                    # Try voting multiple times rapidly (should hit rate limit)
-                    for i in range(12):  # Try 12 votes (should hit limit at 11th)
-                        vote_data = {"option_id": option_id}
-
-                        try:
-                            vote_response = requests.post(
-                                f"{host}/api/polls/{poll_id}/vote/",
-                                data=json.dumps(vote_data),
-                                headers={"Content-Type": "application/json"},
-                            )
+                    # Try 12 votes at once (should hit limit at 11th)
+                    vote_data = {"option_id": option_id}
+                    vote_responses = self.send_burst(
+                        lambda session, data: session.post(
+                            f"{host}/api/polls/{poll_id}/vote/", json=data
+                        ),
+                        [vote_data] * 12,
+                    )
 
-                            if vote_response.status_code == 200:
-                                self.stdout.write(
-                                    self.style.SUCCESS(f"✓ Vote {i+1} successful")
+                    for i, vote_response in enumerate(vote_responses):
+                        if isinstance(vote_response, Exception):
+                            self.stdout.write(
+                                self.style.ERROR(
+                                    f"✗ Error with vote {i+1}: {vote_response}"
                                 )
-                            elif vote_response.status_code == 400:
-                                # Expected after first vote (duplicate vote)
-                                if "already voted" in vote_response.text:
-                                    self.stdout.write(
-                                        self.style.WARNING(
-                                            f"⚠ Vote {i+1} rejected - Already voted (expected)"
-                                        )
-                                    )
-                                else:
-                                    self.stdout.write(
-                                        self.style.ERROR(
-                                            f"✗ Vote {i+1} failed: {vote_response.text}"
-                                        )
-                                    )
-                            elif vote_response.status_code == 429:
+                            )
+                        elif vote_response.status_code == 200:
+                            self.stdout.write(
+                                self.style.SUCCESS(f"✓ Vote {i+1} successful")
+                            )
+                        elif vote_response.status_code == 400:
+                            # Expected after first vote (duplicate vote)
+                            if "already voted" in vote_response.text:
                                 self.stdout.write(
                                     self.style.WARNING(
-                                        f"⚠ Vote {i+1} blocked by rate limit (429) - This is expected!"
+                                        f"⚠ Vote {i+1} rejected - Already voted (expected)"
                                     )
                                 )
-                                break
                             else:
                                 self.stdout.write(
                                     self.style.ERROR(
-                                        f"✗ Vote {i+1} unexpected response: {vote_response.status_code}"
+                                        f"✗ Vote {i+1} failed: {vote_response.text}"
                                     )
                                 )
-                        except Exception as e:
+                        elif vote_response.status_code == 429:
                             self.stdout.write(
-                                self.style.ERROR(f"✗ Error with vote {i+1}: {e}")
+                                self.style.WARNING(
+                                    f"⚠ Vote {i+1} blocked by rate limit (429) - This is expected!"
+                                )
+                            )
+                        else:
+                            self.stdout.write(
+                                self.style.ERROR(
+                                    f"✗ Vote {i+1} unexpected response: {vote_response.status_code}"
+                                )
                             )
-
-                        # Small delay between votes
-                        time.sleep(0.1)
                 else:
                     self.stdout.write(
                         self.style.WARNING("⚠ No polls available for voting test")
@@ -269,15 +274,46 @@ class Command(BaseCommand):
         except Exception as e:
             self.stdout.write(self.style.ERROR(f"✗ Error during voting test: {e}"))
 
+    def send_burst(self, send, payloads):
+        """
+        Send all payloads concurrently and return the responses in order.
+
+        Firing the requests together models burst traffic and lands them
+        inside one rate-limit window. ``send`` is called with the worker's
+        own requests.Session, since a Session is not safe to share between
+        threads. Failed requests are returned as the raised exception.
+        """
+        local = threading.local()
+        sessions = []
+
+        def open_session():
+            local.session = requests.Session()
+            sessions.append(local.session)
+
+        def send_one(payload):
+            try:
+                return send(local.session, payload)
+            except Exception as e:
+                return e
+
+        try:
+            with ThreadPoolExecutor(
+                max_workers=BURST_WORKERS, initializer=open_session
+            ) as executor:
+                return list(executor.map(send_one, payloads))
+        finally:
+            for session in sessions:
+                session.close()
+
     def test_token_refresh(self, host, username, password):
         """Test JWT token refresh functionality."""
         self.stdout.write("\n--- Testing JWT Token Refresh ---")
 
         try:
             # Get fresh tokens
-            response = requests.post(
+            response = self.session.post(
                 f"{host}/api/auth/token/",
-                data={"username": username, "password": password},
+                json={"username": username, "password": password},
             )
 
             if response.status_code == 200:
@@ -285,8 +321,8 @@ class Command(BaseCommand):
                 refresh_token = data.get("refresh")
 
                 # Test token refresh
-                refresh_response = requests.post(
-                    f"{host}/api/auth/token/refresh/", data={"refresh": refresh_token}
+                refresh_response = self.session.post(
+                    f"{host}/api/auth/token/refresh/", json={"refresh": refresh_token}
                 )
 
                 if refresh_response.status_code == 200:
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.7 on 2026-10-15 03:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("polls", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="polloption",
+            name="polls_pollo_poll_id_9abd98_idx",
+        ),
+        migrations.AddIndex(
+            model_name="vote",
+            index=models.Index(
+                fields=["poll", "option"], name="polls_vote_poll_id_98417b_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="vote",
+            index=models.Index(
+                fields=["poll", "voted_at"], name="polls_vote_poll_id_1bacce_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 4.2.7 on 2026-10-15 04:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("polls", "0002_vote_composite_indexes"),
+    ]
+
+    operations = [
+        # Add the named constraint before dropping unique_together so votes
+        # are never left without a uniqueness guarantee
+        migrations.AddConstraint(
+            model_name="vote",
+            constraint=models.UniqueConstraint(
+                fields=("poll", "voter_ip"), name="uniq_vote_poll_ip"
+            ),
+        ),
+        migrations.AlterUniqueTogether(
+            name="vote",
+            unique_together=set(),
+        ),
+        migrations.RemoveIndex(
+            model_name="vote",
+            name="polls_vote_poll_id_83027b_idx",
+        ),
+        migrations.AlterField(
+            model_name="vote",
+            name="poll",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="votes",
+                to="polls.poll",
+            ),
+        ),
+    ]
@@ -1,8 +1,27 @@
 from django.contrib.auth.models import User
-from django.db import models
+from django.db import IntegrityError, connections, models, transaction
+from django.db.models import (BooleanField, ExpressionWrapper, F, FloatField, Q,
+                              Sum, Window)
+from django.db.models.functions import Cast, Coalesce, NullIf, Now
 from django.utils import timezone
 
 
+class PollQuerySet(models.QuerySet):
+    """QuerySet for Poll with expiry helpers evaluated in the database."""
+
+    def with_expired(self):
+        """Annotate each poll with ``_is_expired``, read by Poll.is_expired."""
+        return self.annotate(
+            _is_expired=ExpressionWrapper(
+                Q(expires_at__lt=Now()), output_field=BooleanField()
+            )
+        )
+
+    def active(self):
+        """Active polls that have not expired yet."""
+        return self.filter(is_active=True, expires_at__gte=Now())
+
+
 class Poll(models.Model):
     """
     Model representing a poll with multiple options.
@@ -19,6 +38,8 @@ class Poll(models.Model):
         default=True, help_text="Whether the poll is active"
     )
 
+    objects = PollQuerySet.as_manager()
+
     class Meta:
         ordering = ["-created_at"]
         indexes = [
@@ -32,13 +53,75 @@ class Poll(models.Model):
 
     @property
     def is_expired(self):
-        """Check if the poll has expired."""
+        """
+        Check if the poll has expired.
+
+        Uses the ``_is_expired`` queryset annotation when present.
+        """
+        annotated = getattr(self, "_is_expired", None)
+        if annotated is not None:
+            return annotated
         return timezone.now() > self.expires_at
 
     @property
     def total_votes(self):
-        """Calculate total votes across all options."""
-        return sum(option.vote_count for option in self.options.all())
+        """
+        Total votes across all options.
+
+        Uses the ``_total_votes`` queryset annotation when present, then any
+        prefetched options, and otherwise sums the vote counts in SQL.
+        """
+        annotated = getattr(self, "_total_votes", None)
+        if annotated is not None:
+            return annotated
+        if "options" in getattr(self, "_prefetched_objects_cache", {}):
+            return sum(option.vote_count for option in self.options.all())
+        return self.options.aggregate(total=Sum("vote_count"))["total"] or 0
+
+
+class PollOptionQuerySet(models.QuerySet):
+    """QuerySet for PollOption with result helpers."""
+
+    def with_percentage(self):
+        """
+        Annotate each option with ``percentage`` of its poll's total votes.
+
+        The poll total is a window sum over the options of the same poll, so
+        the percentages are computed in the same query that loads the options.
+        """
+        poll_total = Window(Sum("vote_count"), partition_by=[F("poll_id")])
+        return self.annotate(
+            percentage=Coalesce(
+                Cast(F("vote_count"), FloatField()) * 100.0 / NullIf(poll_total, 0),
+                0.0,
+                output_field=FloatField(),
+            )
+        )
+
+    def add_vote(self, pk):
+        """
+        Add one vote to option ``pk`` and return its new ``vote_count``.
+
+        On PostgreSQL and SQLite the new count comes back from the UPDATE
+        itself via RETURNING. Returns None if the option does not exist.
+        """
+        connection = connections[self.db]
+        if connection.vendor not in ("postgresql", "sqlite"):
+            if not self.filter(pk=pk).update(vote_count=F("vote_count") + 1):
+                return None
+            return self.filter(pk=pk).values_list("vote_count", flat=True).first()
+
+        meta = self.model._meta
+        qn = connection.ops.quote_name
+        vote_count = qn(meta.get_field("vote_count").column)
+        sql = (
+            f"UPDATE {qn(meta.db_table)} SET {vote_count} = {vote_count} + 1 "
+            f"WHERE {qn(meta.pk.column)} = %s RETURNING {vote_count}"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [pk])
+            row = cursor.fetchone()
+        return None if row is None else row[0]
 
 
 class PollOption(models.Model):
@@ -52,31 +135,150 @@ class PollOption(models.Model):
         default=0, help_text="Number of votes for this option"
     )
 
-    class Meta:
-        indexes = [
-            models.Index(fields=["poll"]),
-        ]
+    objects = PollOptionQuerySet.as_manager()
 
     def __str__(self):
         return f"{self.poll.title} - {self.text}"
 
 
+class VoteQuerySet(models.QuerySet):
+    """QuerySet for Vote with conflict-free inserts."""
+
+    def record(self, poll_id, option_id, voter_ip):
+        """
+        Insert a vote unless ``voter_ip`` already voted in the poll.
+
+        Returns the new Vote, or None for a duplicate. On PostgreSQL and SQLite
+        this is a single INSERT ... ON CONFLICT DO NOTHING RETURNING, so a
+        duplicate neither raises nor rolls back the surrounding transaction.
+        """
+        vote = self._new_vote(poll_id, option_id, voter_ip)
+        connection = connections[self.db]
+        if connection.vendor not in ("postgresql", "sqlite"):
+            try:
+                with transaction.atomic(using=self.db):
+                    vote.save(using=self.db, force_insert=True)
+            except IntegrityError:
+                return None
+            return vote
+
+        sql, params = self._insert_sql(vote, connection)
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            row = cursor.fetchone()
+        return self._inserted(vote, row)
+
+    def cast(self, poll_id, option_id, voter_ip):
+        """
+        Record a vote and add it to its option's ``vote_count``.
+
+        Returns the new Vote, with the option's updated count as
+        ``option_vote_count``, or None for a duplicate, in which case the count
+        is left alone. On PostgreSQL both writes run as one statement: the
+        insert is a writable CTE joined into the UPDATE, so the count only
+        moves when a vote row was actually inserted.
+        """
+        connection = connections[self.db]
+        if connection.vendor != "postgresql":
+            with transaction.atomic(using=self.db):
+                vote = self.record(poll_id, option_id, voter_ip)
+                if vote is not None:
+                    vote.option_vote_count = PollOption.objects.using(
+                        self.db
+                    ).add_vote(option_id)
+            return vote
+
+        vote = self._new_vote(poll_id, option_id, voter_ip)
+        insert_sql, params = self._insert_sql(vote, connection)
+        qn = connection.ops.quote_name
+        option_meta = PollOption._meta
+        option_table = qn(option_meta.db_table)
+        vote_count = qn(option_meta.get_field("vote_count").column)
+        pk = qn(self.model._meta.pk.column)
+        sql = (
+            f"WITH ins AS ({insert_sql}) "
+            f"UPDATE {option_table} SET {vote_count} = {vote_count} + 1 FROM ins "
+            f"WHERE {option_table}.{qn(option_meta.pk.column)} = %s "
+            f"RETURNING ins.{pk}, {option_table}.{vote_count}"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [*params, option_id])
+            row = cursor.fetchone()
+        vote = self._inserted(vote, row)
+        if vote is not None:
+            vote.option_vote_count = row[1]
+        return vote
+
+    def _new_vote(self, poll_id, option_id, voter_ip):
+        """Build an unsaved vote stamped with the current time."""
+        return self.model(
+            poll_id=poll_id,
+            option_id=option_id,
+            voter_ip=voter_ip,
+            voted_at=timezone.now(),
+        )
+
+    def _insert_sql(self, vote, connection):
+        """Return the INSERT ... ON CONFLICT DO NOTHING SQL and params for a vote."""
+        meta = self.model._meta
+        qn = connection.ops.quote_name
+        fields = [meta.get_field(name) for name in ("poll", "option", "voter_ip")]
+        fields.append(meta.get_field("voted_at"))
+        sql = (
+            "INSERT INTO %s (%s) VALUES (%s) "
+            "ON CONFLICT (%s, %s) DO NOTHING RETURNING %s"
+        ) % (
+            qn(meta.db_table),
+            ", ".join(qn(field.column) for field in fields),
+            ", ".join(["%s"] * len(fields)),
+            qn(fields[0].column),
+            qn(fields[2].column),
+            qn(meta.pk.column),
+        )
+        params = [
+            field.get_db_prep_save(getattr(vote, field.attname), connection)
+            for field in fields
+        ]
+        return sql, params
+
+    def _inserted(self, vote, row):
+        """Mark ``vote`` as saved from a RETURNING row, or return None if empty."""
+        if row is None:
+            return None
+        vote.pk = row[0]
+        vote._state.adding = False
+        vote._state.db = self.db
+        return vote
+
+
 class Vote(models.Model):
     """
     Model representing a single vote for a poll option.
     """
 
-    poll = models.ForeignKey(Poll, on_delete=models.CASCADE, related_name="votes")
+    # No single-column index: the composite indexes below all lead with poll
+    poll = models.ForeignKey(
+        Poll, on_delete=models.CASCADE, related_name="votes", db_index=False
+    )
     option = models.ForeignKey(
         PollOption, on_delete=models.CASCADE, related_name="votes"
     )
     voter_ip = models.GenericIPAddressField(help_text="IP address of the voter")
     voted_at = models.DateTimeField(auto_now_add=True)
 
+    objects = VoteQuerySet.as_manager()
+
     class Meta:
-        unique_together = ("poll", "voter_ip")  # Prevent duplicate voting
+        constraints = [
+            # Prevents duplicate voting; its index also serves (poll, voter_ip)
+            # lookups and the ON CONFLICT target in VoteQuerySet
+            models.UniqueConstraint(
+                fields=["poll", "voter_ip"], name="uniq_vote_poll_ip"
+            ),
+        ]
         indexes = [
-            models.Index(fields=["poll", "voter_ip"]),
+            models.Index(fields=["poll", "option"]),
+            models.Index(fields=["poll", "voted_at"]),
             models.Index(fields=["voted_at"]),
         ]
 
@@ -0,0 +1,191 @@
+"""
+Redis-backed rate limiting for the polls API.
+"""
+
+import os
+
+from rest_framework.throttling import UserRateThrottle
+
+from .utils import client_ip
+
+# Rolling-window limiter run atomically inside Redis.
+# KEYS[1] = limiter key
+# ARGV[1] = now (ms), ARGV[2] = window (ms), ARGV[3] = limit, ARGV[4] = member
+# Returns 1 when the request is allowed and 0 when it is throttled.
+SLIDING_WINDOW_LUA = """
+redis.call('ZREMRANGEBYSCORE', KEYS[1], 0, ARGV[1] - ARGV[2])
+local n = redis.call('ZCARD', KEYS[1])
+if n >= tonumber(ARGV[3]) then return 0 end
+redis.call('ZADD', KEYS[1], ARGV[1], ARGV[4])
+redis.call('PEXPIRE', KEYS[1], ARGV[2])
+return 1
+"""
+
+# Bucketed limiter run atomically inside Redis. Throttled requests are not
+# counted, so a client that keeps retrying is let back in once its window
+# has room, as with DRF's own throttles.
+# KEYS = the window's bucket keys, oldest first; the last is the current one
+# ARGV[1] = limit, ARGV[2] = bucket key TTL (s)
+# Returns 1 when the request is allowed and 0 when it is throttled.
+BUCKETED_LUA = """
+local total = 0
+for _, count in ipairs(redis.call('MGET', unpack(KEYS))) do
+    if count then total = total + tonumber(count) end
+end
+if total >= tonumber(ARGV[1]) then return 0 end
+redis.call('INCR', KEYS[#KEYS])
+redis.call('EXPIRE', KEYS[#KEYS], ARGV[2])
+return 1
+"""
+
+# Number of fixed buckets a bucketed throttle splits its window into
+THROTTLE_BUCKETS = 10
+
+_sliding_window_script = None
+_bucketed_script = None
+
+
+def get_redis_client():
+    """Return the raw Redis client behind the default cache, if there is one."""
+    try:
+        from django_redis import get_redis_connection
+
+        return get_redis_connection("default")
+    except (ImportError, NotImplementedError):
+        return None
+
+
+def _get_sliding_window_script(client):
+    """Register the limiter script once; redis-py then calls it via EVALSHA."""
+    global _sliding_window_script
+    if _sliding_window_script is None:
+        _sliding_window_script = client.register_script(SLIDING_WINDOW_LUA)
+    return _sliding_window_script
+
+
+def _get_bucketed_script(client):
+    """Register the bucketed limiter script once, like the sliding window."""
+    global _bucketed_script
+    if _bucketed_script is None:
+        _bucketed_script = client.register_script(BUCKETED_LUA)
+    return _bucketed_script
+
+
+class ClientIPThrottleMixin:
+    """
+    Identify anonymous clients by the same IP that votes are stored under.
+
+    DRF's get_ident keys on the whole X-Forwarded-For chain, so a client
+    could change its limiter key by adding hops without changing its voter IP.
+    """
+
+    def get_ident(self, request):
+        return client_ip(request.META)
+
+
+class SlidingWindowRateThrottle(ClientIPThrottleMixin, UserRateThrottle):
+    """
+    User/IP throttle with an exact rolling window kept in a Redis sorted set.
+
+    Each check is a single script call, so the trim, count and insert happen
+    in one round trip without races between workers. When the default cache
+    is not Redis (e.g. in tests), it falls back to DRF's cache-based history.
+    """
+
+    cache_format = "rl:%(scope)s:%(ident)s"
+
+    def allow_request(self, request, view):
+        client = get_redis_client()
+        if client is None:
+            return super().allow_request(request, view)
+
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.history = []
+        self.now = self.timer()
+        now_ms = int(self.now * 1000)
+        # A random suffix keeps concurrent requests in the same ms distinct
+        member = f"{now_ms}-{os.urandom(4).hex()}"
+
+        script = _get_sliding_window_script(client)
+        allowed = script(
+            keys=[self.key],
+            args=[now_ms, self.duration * 1000, self.num_requests, member],
+        )
+        if allowed:
+            return True
+        return self.throttle_failure()
+
+
+class BucketedRateThrottleMixin:
+    """
+    Approximate sliding window built from fixed-size Redis counters.
+
+    The window is split into THROTTLE_BUCKETS buckets. Each check is one
+    script call that sums the buckets and, only if the request is allowed,
+    increments the current one. Without Redis, the DRF cache-based history
+    is used.
+    """
+
+    def allow_request(self, request, view):
+        client = get_redis_client()
+        if client is None:
+            return super().allow_request(request, view)
+
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.history = []
+        self.now = self.timer()
+        bucket_size = self.duration / THROTTLE_BUCKETS
+        current = int(self.now // bucket_size)
+        keys = [
+            f"{self.key}:{bucket}"
+            for bucket in range(current - THROTTLE_BUCKETS + 1, current + 1)
+        ]
+
+        script = _get_bucketed_script(client)
+        if script(keys=keys, args=[self.num_requests, self.duration]):
+            return True
+        return self.throttle_failure()
+
+    def wait(self):
+        """Seconds until the oldest bucket leaves the window."""
+        if not self.history:
+            bucket_size = self.duration / THROTTLE_BUCKETS
+            return bucket_size - (self.now % bucket_size)
+        return super().wait()
+
+
+class BucketedRateThrottle(
+    ClientIPThrottleMixin, BucketedRateThrottleMixin, UserRateThrottle
+):
+    """
+    Default throttle for anonymous and authenticated clients alike.
+
+    Anonymous clients are counted under the "anon" rate by IP and users under
+    the "user" rate by id, so each request makes one Redis round trip. A
+    separate anon/user pair made two for anonymous clients, whose looser
+    "user" limit could never trip first.
+    """
+
+    def __init__(self):
+        # The scope, and so the rate, is only known per request; skip the
+        # lookup and parse SimpleRateThrottle.__init__ would do for "user"
+        pass
+
+    def allow_request(self, request, view):
+        user = getattr(request, "user", None)
+        self.scope = "user" if user and user.is_authenticated else "anon"
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        return super().allow_request(request, view)
@@ -1,11 +1,49 @@
+import copy
+
+from django.conf import settings
 from django.contrib.auth.models import User
+from django.db import models, transaction
 from django.utils import timezone
 from rest_framework import serializers
 
 from .models import Poll, PollOption, Vote
+from .utils import client_ip
+
+
+def _get_default_user_id():
+    """Return the id of the fallback poll creator, creating it on first use."""
+    default_user, _ = User.objects.get_or_create(
+        username="test_user", defaults={"email": "test@example.com"}
+    )
+    return default_user.pk
+
+
+def _copy_field(field):
+    """Copy a cached field; fields that nest other fields are copied deeply."""
+    if hasattr(field, "child") or hasattr(field, "child_relation"):
+        return copy.deepcopy(field)
+    return copy.copy(field)
+
+
+class CachedModelSerializer(serializers.ModelSerializer):
+    """
+    ModelSerializer that introspects its model only once per class.
+
+    ModelSerializer.get_fields() rebuilds every field from the model's _meta
+    on each instantiation. The result only depends on the class, so the
+    first build is kept and later instances get copies of it.
+    """
 
+    _fields_cache = {}
 
-class PollOptionSerializer(serializers.ModelSerializer):
+    def get_fields(self):
+        fields = self._fields_cache.get(type(self))
+        if fields is None:
+            fields = self._fields_cache[type(self)] = super().get_fields()
+        return {name: _copy_field(field) for name, field in fields.items()}
+
+
+class PollOptionSerializer(CachedModelSerializer):
     """Serializer for PollOption model."""
 
     class Meta:
@@ -13,7 +51,7 @@ class PollOptionSerializer(serializers.ModelSerializer):
         fields = ["id", "text", "vote_count"]
 
 
-class PollOptionNestedSerializer(serializers.ModelSerializer):
+class PollOptionNestedSerializer(CachedModelSerializer):
     """Serializer for creating PollOption within polls (nested creation)."""
 
     class Meta:
@@ -21,7 +59,7 @@ class PollOptionNestedSerializer(serializers.ModelSerializer):
         fields = ["text"]  # Only text field for nested creation
 
 
-class PollOptionCreateSerializer(serializers.ModelSerializer):
+class PollOptionCreateSerializer(CachedModelSerializer):
     """Serializer for creating PollOption."""
 
     class Meta:
@@ -29,7 +67,7 @@ class PollOptionCreateSerializer(serializers.ModelSerializer):
         fields = ["poll", "text"]  # Include poll field for standalone creation
 
 
-class PollOptionStandaloneSerializer(serializers.ModelSerializer):
+class PollOptionStandaloneSerializer(CachedModelSerializer):
     """Serializer for creating standalone poll options (for API endpoint)."""
 
     class Meta:
@@ -37,7 +75,7 @@ class PollOptionStandaloneSerializer(serializers.ModelSerializer):
         fields = ["poll", "text"]
 
 
-class PollOptionUpdateSerializer(serializers.ModelSerializer):
+class PollOptionUpdateSerializer(CachedModelSerializer):
     """Serializer for updating poll options (text only)."""
 
     class Meta:
@@ -45,7 +83,7 @@ class PollOptionUpdateSerializer(serializers.ModelSerializer):
         fields = ["text"]
 
 
-class VoteCreateSerializer(serializers.ModelSerializer):
+class VoteCreateSerializer(CachedModelSerializer):
     """Serializer for creating votes via the votes API endpoint."""
 
     class Meta:
@@ -57,7 +95,8 @@ class VoteCreateSerializer(serializers.ModelSerializer):
         poll = data.get("poll")
         option = data.get("option")
 
-        if option.poll != poll:
+        # Compare ids so option.poll is not fetched just for this check
+        if option.poll_id != poll.id:
             raise serializers.ValidationError(
                 "Option does not belong to the specified poll."
             )
@@ -69,11 +108,7 @@ class VoteCreateSerializer(serializers.ModelSerializer):
         # Get IP from request context
         request = self.context.get("request")
         if request:
-            x_forwarded_for = request.META.get("HTTP_X_FORWARDED_FOR")
-            if x_forwarded_for:
-                voter_ip = x_forwarded_for.split(",")[0]
-            else:
-                voter_ip = request.META.get("REMOTE_ADDR")
+            voter_ip = client_ip(request.META)
         else:
             voter_ip = "127.0.0.1"  # Default for tests
 
@@ -81,7 +116,7 @@ class VoteCreateSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(CachedModelSerializer):
     """Serializer for User model."""
 
     class Meta:
@@ -89,12 +124,27 @@ class UserSerializer(serializers.ModelSerializer):
         fields = ["id", "username", "first_name", "last_name"]
 
 
-class PollSerializer(serializers.ModelSerializer):
+class PollBatchSerializer(serializers.ListSerializer):
+    """
+    List serializer for polls that renders every item in one tight loop.
+
+    Instead of running the child serializer once per poll, it builds the same
+    dicts with serialize_poll_list(), including the description only when the
+    child serializer has that field.
+    """
+
+    def to_representation(self, data):
+        polls = data.all() if isinstance(data, models.Manager) else data
+        full = "description" in self.child.Meta.fields
+        return serialize_poll_list(polls, full=full)
+
+
+class PollSerializer(CachedModelSerializer):
     """Serializer for Poll model with read operations."""
 
     options = PollOptionSerializer(many=True, read_only=True)
     created_by = UserSerializer(read_only=True)
-    total_votes = serializers.SerializerMethodField()
+    total_votes = serializers.IntegerField(read_only=True)
     is_expired = serializers.ReadOnlyField()
 
     class Meta:
@@ -111,13 +161,66 @@ class PollSerializer(serializers.ModelSerializer):
             "total_votes",
             "is_expired",
         ]
+        list_serializer_class = PollBatchSerializer
 
-    def get_total_votes(self, obj):
-        """Calculate total votes for the poll."""
-        return obj.total_votes
 
+class PollListSerializer(PollSerializer):
+    """Serializer for poll list entries, without the long description."""
 
-class PollUpdateSerializer(serializers.ModelSerializer):
+    class Meta(PollSerializer.Meta):
+        fields = [
+            field for field in PollSerializer.Meta.fields if field != "description"
+        ]
+
+
+# Shared field used to format datetimes exactly like the serializers do
+_datetime_field = serializers.DateTimeField()
+
+
+def serialize_poll_list(polls, full=False):
+    """
+    Build the PollListSerializer representation for many polls at once.
+
+    List responses are the hottest read path, so this skips DRF's per-field
+    dispatch and builds plain dicts directly. Polls should come from
+    PollViewSet.get_queryset(), with the creator selected and the options
+    prefetched. The output must stay identical to PollListSerializer, or to
+    PollSerializer when ``full`` is set.
+    """
+    to_datetime = _datetime_field.to_representation
+    data = []
+    for poll in polls:
+        item = {"id": poll.id, "title": poll.title}
+        if full:
+            item["description"] = poll.description
+        item.update(
+            {
+                "created_by": {
+                    "id": poll.created_by.id,
+                    "username": poll.created_by.username,
+                    "first_name": poll.created_by.first_name,
+                    "last_name": poll.created_by.last_name,
+                },
+                "created_at": to_datetime(poll.created_at),
+                "expires_at": to_datetime(poll.expires_at),
+                "is_active": poll.is_active,
+                "options": [
+                    {
+                        "id": option.id,
+                        "text": option.text,
+                        "vote_count": option.vote_count,
+                    }
+                    for option in poll.options.all()
+                ],
+                "total_votes": poll.total_votes,
+                "is_expired": poll.is_expired,
+            }
+        )
+        data.append(item)
+    return data
+
+
+class PollUpdateSerializer(CachedModelSerializer):
     """Serializer for updating polls (without options)."""
 
     class Meta:
@@ -137,7 +240,7 @@ class PollUpdateSerializer(serializers.ModelSerializer):
         return value
 
 
-class PollCreateSerializer(serializers.ModelSerializer):
+class PollCreateSerializer(CachedModelSerializer):
     """Serializer for creating polls with options."""
 
     options = PollOptionNestedSerializer(many=True, write_only=True)
@@ -166,20 +269,23 @@ class PollCreateSerializer(serializers.ModelSerializer):
         request = self.context.get("request")
         if request and hasattr(request, "user") and request.user.is_authenticated:
             validated_data["created_by"] = request.user
+        elif settings.DEBUG:
+            # For local development without an authenticated user, fall back
+            # to a shared default user
+            validated_data["created_by_id"] = _get_default_user_id()
         else:
-            # For tests or when no authenticated user, get or create a default user
-            from django.contrib.auth.models import User
-
-            default_user, created = User.objects.get_or_create(
-                username="test_user", defaults={"email": "test@example.com"}
+            raise serializers.ValidationError(
+                "An authenticated user is required to create a poll."
             )
-            validated_data["created_by"] = default_user
 
-        poll = Poll.objects.create(**validated_data)
-
-        # Create options for the poll
-        for option_data in options_data:
-            PollOption.objects.create(poll=poll, **option_data)
+        # Insert the poll and all of its options in a single transaction,
+        # using one bulk INSERT for the options
+        with transaction.atomic():
+            poll = Poll.objects.create(**validated_data)
+            PollOption.objects.bulk_create(
+                [PollOption(poll=poll, **option_data) for option_data in options_data],
+                batch_size=500,
+            )
 
         return poll
 
@@ -193,19 +299,24 @@ class VoteSerializer(serializers.Serializer):
         """Validate that the option exists and belongs to the poll."""
         poll_id = self.context.get("poll_id")
 
-        try:
-            option = PollOption.objects.get(id=value, poll_id=poll_id)
-        except PollOption.DoesNotExist:
+        # Kept for the view, which needs the option text in its response; a
+        # (id, text) row is enough, so no model instance is built
+        self.option = (
+            PollOption.objects.filter(id=value, poll_id=poll_id)
+            .values_list("id", "text", named=True)
+            .first()
+        )
+        if self.option is None:
             raise serializers.ValidationError("Invalid option for this poll.")
 
         return value
 
 
-class PollResultSerializer(serializers.ModelSerializer):
+class PollResultSerializer(CachedModelSerializer):
     """Serializer for poll results with vote counts and percentages."""
 
     options = serializers.SerializerMethodField()
-    total_votes = serializers.SerializerMethodField()
+    total_votes = serializers.IntegerField(read_only=True)
     results = serializers.SerializerMethodField()  # Add results field for tests
 
     class Meta:
@@ -221,23 +332,24 @@ class PollResultSerializer(serializers.ModelSerializer):
             "expires_at",
         ]
 
-    def get_total_votes(self, obj):
-        """Get total votes for the poll."""
-        return obj.total_votes
-
     def get_results(self, obj):
         """Get results - same as options for backward compatibility."""
         return self.get_options(obj)
 
     def get_options(self, obj):
         """Get options with vote counts and percentages."""
-        total_votes = obj.total_votes
+        total_votes = None
         options_data = []
 
         for option in obj.options.all():
-            percentage = (
-                (option.vote_count / total_votes * 100) if total_votes > 0 else 0
-            )
+            # Prefer the percentage annotated by PollOption.objects.with_percentage()
+            percentage = getattr(option, "percentage", None)
+            if percentage is None:
+                if total_votes is None:
+                    total_votes = obj.total_votes
+                percentage = (
+                    (option.vote_count / total_votes * 100) if total_votes > 0 else 0
+                )
             options_data.append(
                 {
                     "id": option.id,
@@ -248,3 +360,45 @@ class PollResultSerializer(serializers.ModelSerializer):
             )
 
         return options_data
+
+
+def serialize_poll_results(poll):
+    """
+    Build the PollResultSerializer representation of a poll.
+
+    Like serialize_poll_list(), this skips DRF's per-field dispatch on a hot
+    read path. The poll should come from PollViewSet.get_queryset() for the
+    results action, with its options prefetched and their percentages
+    annotated. The output must stay identical to PollResultSerializer.
+    """
+    options = poll.options.all()
+    total_votes = poll.total_votes
+    results = []
+    for option in options:
+        percentage = getattr(option, "percentage", None)
+        if percentage is None:
+            percentage = (
+                (option.vote_count / total_votes * 100) if total_votes > 0 else 0
+            )
+        results.append(
+            {
+                "id": option.id,
+                "text": option.text,
+                "vote_count": option.vote_count,
+                "percentage": round(percentage, 2),
+            }
+        )
+
+    to_datetime = _datetime_field.to_representation
+    return {
+        "id": poll.id,
+        "title": poll.title,
+        "description": poll.description,
+        "total_votes": total_votes,
+        # The same list serves both keys, so large polls hold (and cache, as
+        # pickle keeps shared references) each option only once
+        "options": results,
+        "results": results,
+        "created_at": to_datetime(poll.created_at),
+        "expires_at": to_datetime(poll.expires_at),
+    }
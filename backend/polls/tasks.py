@@ -0,0 +1,27 @@
+from celery import shared_task
+
+from .cache_keys import touch_poll_list
+from .vote_counts import flush_vote_counts, get_vote_buffer
+from .vote_queue import flush_vote_queue, get_vote_queue
+
+
+@shared_task
+def flush_vote_count_buffer():
+    """Fold buffered Redis vote counts into the database."""
+    client = get_vote_buffer()
+    if client is None:
+        return 0
+    moved = flush_vote_counts(client)
+    if moved:
+        # Poll list entries show the stored counts, so their ETag moves on
+        touch_poll_list()
+    return moved
+
+
+@shared_task
+def flush_vote_queue_to_db():
+    """Insert the vote rows queued in Redis into the database."""
+    client = get_vote_queue()
+    if client is None:
+        return 0
+    return flush_vote_queue(client)
@@ -1,8 +1,6 @@
-from django.contrib.auth import views as auth_views
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from .auth_views import register
 from .views import (PollOptionViewSet, PollViewSet, VoteViewSet, detail, index,
                     results, vote)
 
@@ -13,17 +11,36 @@ router.register(r"polls", PollViewSet, basename="polls")
 router.register(r"poll-options", PollOptionViewSet, basename="poll-options")
 router.register(r"votes", VoteViewSet, basename="votes")
 
-urlpatterns = [
-    path("api/", include(router.urls)),
+poll_options_list = PollOptionViewSet.as_view({"get": "list"})
+
+# Routes are grouped under shared prefixes so the resolver skips a whole
+# group as soon as its prefix does not match
+api_urlpatterns = [
+    path("", include(router.urls)),
     # Nested poll options endpoint
     path(
-        "api/polls/<int:poll_id>/options/",
-        PollOptionViewSet.as_view({"get": "list"}),
+        "polls/<int:poll_id>/options/",
+        poll_options_list,
         name="poll-options-list",
     ),
-    # Django template views
-    path("polls/", index, name="index"),
-    path("polls/<int:poll_id>/", detail, name="detail"),
-    path("polls/<int:poll_id>/results/", results, name="results"),
-    path("polls/<int:poll_id>/vote/", vote, name="vote"),
+]
+
+# Django template views
+poll_urlpatterns = [
+    path("", index, name="index"),
+    path(
+        "<int:poll_id>/",
+        include(
+            [
+                path("", detail, name="detail"),
+                path("results/", results, name="results"),
+                path("vote/", vote, name="vote"),
+            ]
+        ),
+    ),
+]
+
+urlpatterns = [
+    path("api/", include(api_urlpatterns)),
+    path("polls/", include(poll_urlpatterns)),
 ]
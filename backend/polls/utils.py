@@ -0,0 +1,41 @@
+"""
+Request helpers shared by the polls views and serializers.
+"""
+
+from ipaddress import ip_address
+
+# request.META keys used to resolve the voter's IP address
+X_FORWARDED_FOR = "HTTP_X_FORWARDED_FOR"
+REMOTE_ADDR = "REMOTE_ADDR"
+# Application key the resolved IP is memoized under; WSGI reserves dotted
+# lowercase environ keys for this, and DRF's Request shares Django's META
+CLIENT_IP = "polls.client_ip"
+
+
+def _parse_ip(value):
+    """Return ``value`` as a normalized IP address string, or None if invalid."""
+    try:
+        return str(ip_address(value))
+    except ValueError:
+        return None
+
+
+def client_ip(meta):
+    """
+    Return the client IP from request.META, preferring the first proxy hop.
+
+    The address is parsed and normalized, so a malformed X-Forwarded-For value
+    falls back to REMOTE_ADDR instead of failing the inet column on save. The
+    result is stored back in ``meta``, so the throttles, view and serializers
+    handling one request only parse the headers once.
+    """
+    ip = meta.get(CLIENT_IP)
+    if ip is None:
+        forwarded_for = meta.get(X_FORWARDED_FOR)
+        if forwarded_for:
+            # partition avoids building a list of every hop
+            ip = _parse_ip(forwarded_for.partition(",")[0].strip())
+        if ip is None:
+            ip = _parse_ip(meta.get(REMOTE_ADDR) or "") or "127.0.0.1"
+        meta[CLIENT_IP] = ip
+    return ip
@@ -1,35 +1,179 @@
+import hashlib
+import json
+import time
+from collections import namedtuple
+
 from django.contrib import messages
-from django.db import transaction
-from django.db.models import F
-from django.http import HttpResponse
+from django.core.cache import cache
+from django.db import DatabaseError, transaction
+from django.db.models import F, Prefetch
+from django.db.models.functions import Now
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.http import Http404, HttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.utils import timezone
-from django.utils.decorators import method_decorator
-from django_ratelimit.decorators import ratelimit
-from drf_yasg import openapi
-from drf_yasg.utils import swagger_auto_schema
+from django.utils.http import parse_etags, quote_etag
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
-from rest_framework.throttling import AnonRateThrottle, UserRateThrottle
 
+from .cache_keys import (invalidate_poll_results, poll_list_version,
+                         results_cache_keys, touch_poll_list, voted_key)
 from .models import Poll, PollOption, Vote
+from .ratelimit import BucketedRateThrottle, SlidingWindowRateThrottle
+from .schema import openapi, swagger_auto_schema
 from .serializers import (PollCreateSerializer, PollOptionStandaloneSerializer,
-                          PollOptionUpdateSerializer, PollResultSerializer,
-                          PollSerializer, PollUpdateSerializer,
-                          VoteCreateSerializer, VoteSerializer)
+                          PollListSerializer, PollOptionUpdateSerializer,
+                          PollResultSerializer, PollSerializer,
+                          PollUpdateSerializer, VoteCreateSerializer,
+                          VoteSerializer, serialize_poll_results)
+from .utils import client_ip
+from .vote_counts import apply_pending_votes, buffer_vote, get_vote_buffer
+from .vote_queue import get_vote_queue, queue_vote
+
+
+# Poll results are read-heavy and only change when votes arrive, so they are
+# cached briefly. A longer-lived stale copy is served if the database fails.
+RESULTS_CACHE_TIMEOUT = 10
+RESULTS_STALE_TIMEOUT = 300
+# Longest a rebuild may hold the results lock before another request retries
+RESULTS_LOCK_TIMEOUT = 5
+
+
+def _results_etag(data):
+    """Return a quoted ETag that changes whenever the results payload does."""
+    payload = json.dumps(data, sort_keys=True, default=str).encode()
+    return quote_etag(hashlib.sha1(payload).hexdigest())
+
+
+# The poll list ETag combines a version bumped on every poll, option or vote
+# change with a time window, so expiry flags can be at most this stale
+POLL_LIST_ETAG_WINDOW = 10
+
+
+def _poll_list_etag(request):
+    """Return the weak ETag of the poll list page ``request`` asks for."""
+    window = int(time.time() // POLL_LIST_ETAG_WINDOW)
+    path = hashlib.sha1(request.get_full_path().encode()).hexdigest()
+    return f'W/"{poll_list_version()}-{window}-{path}"'
+
+
+# Per-process cache of the poll fields the vote path reads, by poll pk
+POLL_META_TIMEOUT = 10
+POLL_META_MAX_ENTRIES = 10_000
+PollMeta = namedtuple("PollMeta", ["id", "title", "expires_at"])
+_poll_meta_cache = {}
+
+
+@receiver([post_save, post_delete], sender=Poll)
+def forget_poll_meta(sender, instance, **kwargs):
+    """Drop a poll's cached vote metadata when it changes in this process."""
+    _poll_meta_cache.pop(str(instance.pk), None)
+
+
+@receiver([post_save, post_delete], sender=Poll)
+@receiver([post_save, post_delete], sender=PollOption)
+def poll_list_changed(sender, instance, **kwargs):
+    """Move the poll list ETag on once a poll or option change commits."""
+    transaction.on_commit(touch_poll_list)
+
+
+def cast_vote(poll, option_id, voter_ip):
+    """
+    Record a vote unless the cache already saw this voter in the poll.
+
+    cache.add is an atomic SET NX on Redis, so repeat votes are turned away
+    without a database write; the (poll, voter_ip) constraint stays the
+    authority for voters the cache has forgotten. Returns the Vote or None;
+    with DEFER_VOTE_WRITES the Vote is returned unsaved and only its count is
+    written before the response. The option's new count is set as
+    ``vote.option_vote_count``, or None while counts are buffered in Redis.
+    """
+    key = voted_key(poll.id, voter_ip)
+    timeout = max(int((poll.expires_at - timezone.now()).total_seconds()), 1)
+    if not cache.add(key, True, timeout):
+        return None
+    try:
+        buffer = get_vote_buffer()
+        queue = get_vote_queue()
+        if queue is not None:
+            # The marker is the only duplicate check on this path; the row is
+            # inserted later by the flush_vote_queue task
+            vote = queue_vote(
+                queue,
+                Vote(
+                    poll_id=poll.id,
+                    option_id=option_id,
+                    voter_ip=voter_ip,
+                    voted_at=timezone.now(),
+                ),
+            )
+            if buffer is not None:
+                buffer_vote(buffer, option_id)
+                vote.option_vote_count = None
+            else:
+                vote.option_vote_count = PollOption.objects.add_vote(option_id)
+            return vote
+        if buffer is None:
+            return Vote.objects.cast(poll.id, option_id, voter_ip)
+        # Only the vote row is written now; the count is flushed in batches
+        vote = Vote.objects.record(poll.id, option_id, voter_ip)
+        if vote is not None:
+            buffer_vote(buffer, option_id)
+            vote.option_vote_count = None
+        return vote
+    except Exception:
+        # Let the voter retry after an unexpected failure
+        cache.delete(key)
+        raise
+
+
+# Actions that serialize whole polls and need their relations preloaded
+POLL_READ_ACTIONS = frozenset({"list", "retrieve", "results"})
+
+# Columns loaded for poll list entries; the creator fields feed the nested user
+LIST_POLL_FIELDS = (
+    "id",
+    "title",
+    "created_by_id",
+    "created_at",
+    "expires_at",
+    "is_active",
+    "created_by__id",
+    "created_by__username",
+    "created_by__first_name",
+    "created_by__last_name",
+)
+
+# Columns the vote action and the results endpoint read
+VOTE_POLL_FIELDS = ("id", "title", "expires_at")
+RESULT_POLL_FIELDS = ("id", "title", "description", "created_at", "expires_at")
+RESULT_OPTION_FIELDS = ("id", "poll_id", "text", "vote_count")
 
 
 # Custom throttle classes for specific operations
-class VotingRateThrottle(UserRateThrottle):
+class VotingRateThrottle(SlidingWindowRateThrottle):
     scope = "voting"
 
 
-class PollCreationRateThrottle(UserRateThrottle):
+class PollCreationRateThrottle(SlidingWindowRateThrottle):
     scope = "poll_creation"
 
 
+DEFAULT_THROTTLE_CLASSES = (BucketedRateThrottle,)
+
+# Actions that need a logged-in user; permission objects hold no per-request
+# state, so each set is built once and shared by every request
+AUTHENTICATED_ACTIONS = frozenset({"create", "update", "partial_update", "destroy"})
+# Actions restricted to the poll's creator
+OWNER_ACTIONS = frozenset({"update", "partial_update", "destroy"})
+AUTHENTICATED_PERMISSIONS = (IsAuthenticated(),)
+PUBLIC_PERMISSIONS = (AllowAny(),)
+
+
 class PollViewSet(viewsets.ModelViewSet):
     """
     ViewSet for managing polls with JWT authentication and rate limiting.
@@ -43,53 +187,116 @@ class PollViewSet(viewsets.ModelViewSet):
     """
 
     queryset = Poll.objects.filter(is_active=True)
+    serializer_classes_by_action = {
+        "create": PollCreateSerializer,
+        "update": PollUpdateSerializer,
+        "partial_update": PollUpdateSerializer,
+        "results": PollResultSerializer,
+    }
+    throttle_classes_by_action = {
+        "create": (PollCreationRateThrottle,),
+        "vote": (VotingRateThrottle,),
+    }
+
+    def get_queryset(self):
+        """
+        Return active polls for the current action.
+
+        Actions that render polls also get the creator, ordered options, vote
+        totals and expiry preloaded; writes and votes only need the poll row.
+        """
+        queryset = Poll.objects.filter(is_active=True)
+        if self.action == "vote":
+            return queryset.only(*VOTE_POLL_FIELDS)
+        if self.action not in POLL_READ_ACTIONS:
+            return queryset
+
+        options = PollOption.objects.order_by("id")
+        if self.action == "results":
+            # Results render no creator or expiry flag, so skip loading them;
+            # the vote total is summed from the prefetched options instead of
+            # a join and GROUP BY on the poll query
+            options = options.only(*RESULT_OPTION_FIELDS).with_percentage()
+            return queryset.only(*RESULT_POLL_FIELDS).prefetch_related(
+                Prefetch("options", queryset=options)
+            )
+
+        queryset = queryset.select_related("created_by")
+        if self.action == "list" and not self.wants_full_polls():
+            # Leave the long description column out of list queries
+            queryset = queryset.only(*LIST_POLL_FIELDS)
+        if self.action == "list":
+            # Expiry is filtered in SQL, where the expires_at index applies
+            expired = self.request.query_params.get("expired")
+            if expired == "0":
+                queryset = queryset.active()
+            elif expired == "1":
+                queryset = queryset.filter(expires_at__lt=Now())
+        # Poll.total_votes sums the prefetched options, so the poll query
+        # needs no join or GROUP BY for it
+        return queryset.with_expired().prefetch_related(
+            Prefetch("options", queryset=options)
+        )
+
+    def wants_full_polls(self):
+        """Whether the client asked for full poll fields with ``?full=1``."""
+        return self.request.query_params.get("full") == "1"
 
     def get_serializer_class(self):
         """Return appropriate serializer based on action."""
-        if self.action == "create":
-            return PollCreateSerializer
-        elif self.action in ["update", "partial_update"]:
-            return PollUpdateSerializer
-        elif self.action == "results":
-            return PollResultSerializer
-        return PollSerializer
+        if self.action == "list" and not self.wants_full_polls():
+            return PollListSerializer
+        return self.serializer_classes_by_action.get(self.action, PollSerializer)
 
     def get_permissions(self):
         """Set permissions based on action."""
-        if self.action in ["create", "update", "partial_update", "destroy"]:
-            permission_classes = [IsAuthenticated]
-        else:
-            permission_classes = [AllowAny]
-        return [permission() for permission in permission_classes]
+        if self.action in AUTHENTICATED_ACTIONS:
+            return AUTHENTICATED_PERMISSIONS
+        return PUBLIC_PERMISSIONS
 
     def check_object_permissions(self, request, obj):
         """Check if user has permission to modify this poll."""
         super().check_object_permissions(request, obj)
 
         # For update/delete actions, only poll owner can modify
-        if self.action in ["update", "partial_update", "destroy"]:
-            if obj.created_by != request.user:
-                from rest_framework.exceptions import PermissionDenied
-
-                raise PermissionDenied("You can only modify polls you created.")
+        if self.action in OWNER_ACTIONS and obj.created_by_id != request.user.id:
+            raise PermissionDenied("You can only modify polls you created.")
 
     def get_throttles(self):
         """Set throttles based on action."""
-        if self.action == "create":
-            throttle_classes = [PollCreationRateThrottle]
-        elif self.action == "vote":
-            throttle_classes = [VotingRateThrottle]
-        else:
-            throttle_classes = [AnonRateThrottle, UserRateThrottle]
+        # Throttles record per-request state, so they are never shared
+        throttle_classes = self.throttle_classes_by_action.get(
+            self.action, DEFAULT_THROTTLE_CLASSES
+        )
         return [throttle() for throttle in throttle_classes]
 
     @swagger_auto_schema(
-        operation_description="List all active polls",
-        responses={200: PollSerializer(many=True)},
+        operation_description="List all active polls (add ?full=1 for descriptions)",
+        manual_parameters=[
+            openapi.Parameter(
+                "full",
+                openapi.IN_QUERY,
+                description="Set to 1 to include poll descriptions",
+                type=openapi.TYPE_STRING,
+            ),
+            openapi.Parameter(
+                "expired",
+                openapi.IN_QUERY,
+                description="Set to 0 for open polls only, or 1 for expired ones",
+                type=openapi.TYPE_STRING,
+            ),
+        ],
+        responses={200: PollListSerializer(many=True), 304: "Not Modified"},
     )
     def list(self, request, *args, **kwargs):
-        """List all active polls."""
-        return super().list(request, *args, **kwargs)
+        """List all active polls, answering 304 while the page is unchanged."""
+        etag = _poll_list_etag(request)
+        if etag in parse_etags(request.META.get("HTTP_IF_NONE_MATCH", "")):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = super().list(request, *args, **kwargs)
+        response["ETag"] = etag
+        return response
 
     @swagger_auto_schema(
         operation_description="Create a new poll with options (Rate limited: 5 polls per hour)",
@@ -100,12 +307,11 @@ class PollViewSet(viewsets.ModelViewSet):
             429: "Too Many Requests - Rate limit exceeded (5 polls per hour)",
         },
     )
-    @method_decorator(ratelimit(key="ip", rate="5/h", method="POST", block=True))
     def create(self, request, *args, **kwargs):
         """
         Create a new poll with rate limiting.
 
-        Rate Limited: 5 polls per hour per IP address.
+        Rate Limited: 5 polls per hour per user.
         Requires authentication.
         """
         serializer = self.get_serializer(data=request.data)
@@ -130,17 +336,17 @@ class PollViewSet(viewsets.ModelViewSet):
         request_body=VoteSerializer,
         responses={
             200: openapi.Response("Vote recorded successfully"),
+            202: openapi.Response("Vote accepted and queued for storage"),
             400: "Bad Request - Invalid vote or duplicate voting",
             429: "Too Many Requests - Rate limit exceeded",
         },
     )
-    @method_decorator(ratelimit(key="ip", rate="10/m", method="POST", block=True))
     @action(detail=True, methods=["post"])
     def vote(self, request, pk=None):
         """
         Vote on a poll option with rate limiting.
 
-        Rate Limited: 10 votes per minute per IP address.
+        Rate Limited: 10 votes per minute per user, or per IP when anonymous.
 
         Validates that:
         - Poll is active and not expired
@@ -148,81 +354,132 @@ class PollViewSet(viewsets.ModelViewSet):
         - Option exists for this poll
         - Rate limit not exceeded
         """
-        poll = self.get_object()
-        voter_ip = self.get_client_ip(request)
+        poll = self.get_poll_meta()
+        voter_ip = client_ip(request.META)
 
-        # Check if poll is active and not expired
-        if not poll.is_active or poll.is_expired:
+        # Inactive polls are already a 404 from get_queryset(); expiry is
+        # checked here because the poll details may be cached past it
+        if poll.expires_at < timezone.now():
             return Response(
                 {"error": "Poll is not active or has expired", "code": "POLL_INACTIVE"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # Check if user already voted
-        if Vote.objects.filter(poll=poll, voter_ip=voter_ip).exists():
-            return Response(
-                {
-                    "error": "You have already voted in this poll",
-                    "code": "DUPLICATE_VOTE",
-                },
-                status=status.HTTP_400_BAD_REQUEST,
-            )
-
         # Validate vote data
         serializer = VoteSerializer(data=request.data, context={"poll_id": poll.id})
         serializer.is_valid(raise_exception=True)
 
-        option_id = serializer.validated_data["option_id"]
-
-        try:
-            option = poll.options.get(id=option_id)
-
-            # Create vote record and increment count atomically
-            with transaction.atomic():
-                Vote.objects.create(poll=poll, option=option, voter_ip=voter_ip)
-                PollOption.objects.filter(id=option_id).update(
-                    vote_count=F("vote_count") + 1
-                )
+        option = serializer.option
 
+        # Record the vote and increment the count together; duplicates
+        # are rejected by the cache or, failing that, the unique constraint
+        vote = cast_vote(poll, option.id, voter_ip)
+        if vote is None:
             return Response(
                 {
-                    "message": "Vote recorded successfully",
-                    "option": option.text,
-                    "poll": poll.title,
-                }
+                    "error": "You have already voted in this poll",
+                    "code": "DUPLICATE_VOTE",
+                },
+                status=status.HTTP_400_BAD_REQUEST,
             )
 
-        except PollOption.DoesNotExist:
-            return Response(
-                {"error": "Invalid option"}, status=status.HTTP_400_BAD_REQUEST
-            )
+        invalidate_poll_results(poll.id)
+
+        return Response(
+            {
+                "message": "Vote recorded successfully",
+                "option": option.text,
+                "poll": poll.title,
+                "vote_count": vote.option_vote_count,
+            },
+            # A vote queued by DEFER_VOTE_WRITES is accepted but not yet stored
+            status=status.HTTP_200_OK if vote.pk else status.HTTP_202_ACCEPTED,
+        )
 
     @swagger_auto_schema(
         operation_description="Get poll results with vote counts and percentages",
-        responses={200: PollResultSerializer},
+        responses={200: PollResultSerializer, 304: "Not Modified"},
     )
     @action(detail=True, methods=["get"])
     def results(self, request, pk=None):
         """Get poll results with vote counts and percentages."""
-        poll = self.get_object()
-        serializer = PollResultSerializer(poll)
-        return Response(serializer.data)
-
-    def get_client_ip(self, request):
-        """Extract client IP address from request."""
-        x_forwarded_for = request.META.get("HTTP_X_FORWARDED_FOR")
-        if x_forwarded_for:
-            ip = x_forwarded_for.split(",")[0]
+        cache_key, stale_key = results_cache_keys(pk)
+        cached = cache.get(cache_key)
+        locked = False
+        if cached is None:
+            # Every vote drops the fresh copy, so on a hot poll many readers
+            # miss at once; one rebuilds while the rest serve the stale copy
+            lock_key = f"{cache_key}:lock"
+            locked = cache.add(lock_key, True, RESULTS_LOCK_TIMEOUT)
+            if not locked:
+                cached = cache.get(stale_key)
+        if cached is None:
+            try:
+                poll = self.get_object()
+                apply_pending_votes(poll)
+                data = serialize_poll_results(poll)
+            except DatabaseError:
+                # Serve the last known results rather than failing outright
+                cached = cache.get(stale_key)
+                if cached is None:
+                    raise
+            else:
+                cached = (_results_etag(data), data)
+                cache.set(cache_key, cached, RESULTS_CACHE_TIMEOUT)
+                cache.set(stale_key, cached, RESULTS_STALE_TIMEOUT)
+            finally:
+                if locked:
+                    cache.delete(lock_key)
+
+        etag, data = cached
+        # Clients that already hold these results get an empty 304
+        if_none_match = parse_etags(request.META.get("HTTP_IF_NONE_MATCH", ""))
+        if etag in if_none_match or "*" in if_none_match:
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
         else:
-            ip = request.META.get("REMOTE_ADDR")
-        return ip
+            response = Response(data)
+        response["ETag"] = etag
+        return response
+
+    def get_poll_meta(self):
+        """
+        Return the PollMeta of the poll in the URL, as needed to take a vote.
+
+        Votes on a hot poll keep re-reading the same row, so the few fields
+        needed are kept in a per-process cache for POLL_META_TIMEOUT seconds.
+        """
+        key = str(self.kwargs[self.lookup_url_kwarg or self.lookup_field])
+        now = time.monotonic()
+        entry = _poll_meta_cache.get(key)
+        if entry is not None and entry[0] > now:
+            return entry[1]
+
+        poll = self.get_object()
+        meta = PollMeta(poll.id, poll.title, poll.expires_at)
+        if len(_poll_meta_cache) >= POLL_META_MAX_ENTRIES:
+            _poll_meta_cache.clear()
+        _poll_meta_cache[key] = (now + POLL_META_TIMEOUT, meta)
+        return meta
+
+    def perform_update(self, serializer):
+        """Update the poll and drop its cached results."""
+        super().perform_update(serializer)
+        invalidate_poll_results(serializer.instance.pk)
+
+    def perform_destroy(self, instance):
+        """Delete the poll and drop its cached results."""
+        invalidate_poll_results(instance.pk)
+        super().perform_destroy(instance)
 
 
 class PollOptionViewSet(viewsets.ModelViewSet):
     """ViewSet for managing poll options."""
 
     queryset = PollOption.objects.all()
-    permission_classes = [AllowAny]
+
+    def get_permissions(self):
+        """Anyone may manage options; the permission objects are shared."""
+        return PUBLIC_PERMISSIONS
 
     def get_serializer_class(self):
         """Return appropriate serializer based on action."""
@@ -245,52 +502,10 @@ class VoteViewSet(viewsets.ModelViewSet):
 
     queryset = Vote.objects.all()
     serializer_class = VoteCreateSerializer
-    permission_classes = [AllowAny]
-
-    def get_queryset(self):
-        """Filter votes by poll if needed."""
-        return Vote.objects.all()
-
-    def create(self, request, *args, **kwargs):
-        """Create a vote with duplicate prevention."""
-        serializer = self.get_serializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
-
-        # Get IP address
-        x_forwarded_for = request.META.get("HTTP_X_FORWARDED_FOR")
-        if x_forwarded_for:
-            voter_ip = x_forwarded_for.split(",")[0]
-        else:
-            voter_ip = request.META.get("REMOTE_ADDR", "127.0.0.1")
-
-        poll = serializer.validated_data["poll"]
-        option = serializer.validated_data["option"]
-
-        # Check for duplicate vote
-        if Vote.objects.filter(poll=poll, voter_ip=voter_ip).exists():
-            return Response(
-                {"error": "You have already voted in this poll"},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
-
-        # Create the vote
-        vote = serializer.save(voter_ip=voter_ip)
-
-        # Update option vote count
-        from django.db.models import F
-
-        option.vote_count = F("vote_count") + 1
-        option.save(update_fields=["vote_count"])
-
-        return Response(serializer.data, status=status.HTTP_201_CREATED)
-
 
-class VoteViewSet(viewsets.ModelViewSet):
-    """ViewSet for managing votes."""
-
-    queryset = Vote.objects.all()
-    serializer_class = VoteCreateSerializer
-    permission_classes = [AllowAny]
+    def get_permissions(self):
+        """Anyone may vote; the permission objects are shared."""
+        return PUBLIC_PERMISSIONS
 
     def get_queryset(self):
         """Filter votes by poll if needed."""
@@ -301,12 +516,7 @@ class VoteViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        # Get IP address
-        x_forwarded_for = request.META.get("HTTP_X_FORWARDED_FOR")
-        if x_forwarded_for:
-            voter_ip = x_forwarded_for.split(",")[0]
-        else:
-            voter_ip = request.META.get("REMOTE_ADDR", "127.0.0.1")
+        voter_ip = client_ip(request.META)
 
         poll = serializer.validated_data["poll"]
         option = serializer.validated_data["option"]
@@ -317,26 +527,37 @@ class VoteViewSet(viewsets.ModelViewSet):
                 {"error": "Poll has expired"}, status=status.HTTP_400_BAD_REQUEST
             )
 
-        # Check for duplicate vote
-        if Vote.objects.filter(poll=poll, voter_ip=voter_ip).exists():
+        # Record the vote and update the option vote count together;
+        # duplicates are rejected by the cache or the unique constraint
+        serializer.instance = cast_vote(poll, option.id, voter_ip)
+        if serializer.instance is None:
             return Response(
                 {"error": "You have already voted in this poll"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # Create the vote
-        vote = serializer.save(voter_ip=voter_ip)
-
-        # Update option vote count atomically
-        PollOption.objects.filter(id=option.id).update(vote_count=F("vote_count") + 1)
+        invalidate_poll_results(poll.id)
 
-        return Response(serializer.data, status=status.HTTP_201_CREATED)
+        return Response(
+            serializer.data,
+            # A vote queued by DEFER_VOTE_WRITES is accepted but not yet stored
+            status=(
+                status.HTTP_201_CREATED
+                if serializer.instance.pk
+                else status.HTTP_202_ACCEPTED
+            ),
+        )
 
 
 # Django template views for tests
 def index(request):
     """Poll list view."""
-    latest_poll_list = Poll.objects.filter(is_active=True).order_by("-created_at")[:5]
+    # The template only links each poll by id and title
+    latest_poll_list = (
+        Poll.objects.filter(is_active=True)
+        .only("id", "title")
+        .order_by("-created_at")[:5]
+    )
     context = {"latest_poll_list": latest_poll_list}
     return render(request, "polls/index.html", context)
 
@@ -353,53 +574,69 @@ def results(request, poll_id):
     return render(request, "polls/results.html", {"poll": poll})
 
 
-def vote(request, poll_id):
-    """Vote on a poll."""
+def _render_vote_error(request, poll_id, error_message):
+    """Re-render the poll's voting form with an error message."""
     poll = get_object_or_404(Poll, pk=poll_id)
+    return render(
+        request,
+        "polls/detail.html",
+        {"poll": poll, "error_message": error_message},
+    )
 
-    if request.method == "POST":
-        try:
-            selected_option = poll.options.get(pk=request.POST["choice"])
-        except (KeyError, PollOption.DoesNotExist):
-            return render(
-                request,
-                "polls/detail.html",
-                {
-                    "poll": poll,
-                    "error_message": "You didn't select a choice.",
-                },
-            )
-        except ValueError:
-            # Handle case where choice is not a valid integer
-            return render(
-                request,
-                "polls/detail.html",
-                {
-                    "poll": poll,
-                    "error_message": "You didn't select a choice.",
-                },
-            )
-
-        # Create vote
-        voter_ip = request.META.get("REMOTE_ADDR")
 
-        # Check for duplicate votes
-        if Vote.objects.filter(poll=poll, voter_ip=voter_ip).exists():
-            return render(
-                request,
-                "polls/detail.html",
-                {
-                    "poll": poll,
-                    "error_message": "You have already voted in this poll.",
-                },
+def vote(request, poll_id):
+    """Vote on a poll."""
+    if request.method != "POST":
+        poll = get_object_or_404(Poll, pk=poll_id)
+        return render(request, "polls/detail.html", {"poll": poll})
+
+    try:
+        option_id = int(request.POST["choice"])
+    except (KeyError, ValueError):
+        return _render_vote_error(request, poll_id, "You didn't select a choice.")
+
+    voter_ip = client_ip(request.META)
+
+    # Repeat voters are turned away by the same cache marker the API sets,
+    # before any write; the unique constraint stays the backstop. Only the
+    # poll's expiry is read, so the marker lasts as long as the poll does.
+    expires_at = (
+        Poll.objects.filter(pk=poll_id).values_list("expires_at", flat=True).first()
+    )
+    if expires_at is None:
+        raise Http404("No Poll matches the given query.")
+    marker_key = voted_key(poll_id, voter_ip)
+    timeout = max(int((expires_at - timezone.now()).total_seconds()), 1)
+    if not cache.add(marker_key, True, timeout):
+        return _render_vote_error(
+            request, poll_id, "You have already voted in this poll."
+        )
+
+    # Count the vote in SQL; the row count also tells whether the option
+    # belongs to this poll, so neither the poll nor the option is loaded
+    try:
+        with transaction.atomic():
+            updated = PollOption.objects.filter(
+                poll_id=poll_id, pk=option_id
+            ).update(vote_count=F("vote_count") + 1)
+            duplicate = (
+                updated and Vote.objects.record(poll_id, option_id, voter_ip) is None
             )
-
-        Vote.objects.create(poll=poll, option=selected_option, voter_ip=voter_ip)
-
-        # Update option vote count
-        selected_option.vote_count += 1
-        selected_option.save()
-
-        return redirect("polls:results", poll_id=poll.id)
-
-    return render(request, "polls/detail.html", {"poll": poll})
+            if duplicate:
+                transaction.set_rollback(True)
+    except Exception:
+        cache.delete(marker_key)
+        raise
+
+    if not updated:
+        # No vote was taken, so the voter may still pick a valid option
+        cache.delete(marker_key)
+        return _render_vote_error(request, poll_id, "You didn't select a choice.")
+    if duplicate:
+        return _render_vote_error(
+            request, poll_id, "You have already voted in this poll."
+        )
+
+    invalidate_poll_results(poll_id)
+
+    return redirect("polls:results", poll_id=poll_id)
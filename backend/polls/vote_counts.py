@@ -0,0 +1,134 @@
+"""
+Buffered PollOption.vote_count increments kept in Redis.
+
+When BUFFER_VOTE_COUNTS is on and the default cache is Redis, votes bump a
+per-option Redis counter instead of updating the option row, and the
+flush_vote_counts Celery task folds the counters into the database in one
+UPDATE. This keeps concurrent voters off the hot option row lock.
+"""
+
+from django.conf import settings
+from django.db.models import Case, F, IntegerField, Value, When
+
+from .models import PollOption
+from .ratelimit import get_redis_client
+
+VOTE_DELTA_PREFIX = "vote-delta:"
+
+# Held while flushing so overlapping runs cannot apply the same counters twice
+VOTE_COUNTS_LOCK_KEY = "vote-counts:lock"
+VOTE_COUNTS_LOCK_TIMEOUT = 60
+
+# Take flushed votes off the counters, dropping counters that reach zero.
+# KEYS = counter keys, ARGV = the matching flushed counts
+SETTLE_DELTAS_LUA = """
+for i, key in ipairs(KEYS) do
+    if redis.call('DECRBY', key, ARGV[i]) <= 0 then
+        redis.call('DEL', key)
+    end
+end
+return 0
+"""
+
+_settle_deltas_script = None
+
+
+def _get_settle_deltas_script(client):
+    """Register the settle script once; redis-py then calls it via EVALSHA."""
+    global _settle_deltas_script
+    if _settle_deltas_script is None:
+        _settle_deltas_script = client.register_script(SETTLE_DELTAS_LUA)
+    return _settle_deltas_script
+
+
+def get_vote_buffer():
+    """Return the Redis client to buffer vote counts in, or None if disabled."""
+    if not settings.BUFFER_VOTE_COUNTS:
+        return None
+    return get_redis_client()
+
+
+def buffer_vote(client, option_id):
+    """Count one vote for ``option_id`` in Redis."""
+    client.incr(f"{VOTE_DELTA_PREFIX}{option_id}")
+
+
+def pending_vote_counts(client, option_ids):
+    """Return {option_id: votes not yet flushed} for the given options."""
+    option_ids = list(option_ids)
+    if not option_ids:
+        return {}
+    counts = client.mget([f"{VOTE_DELTA_PREFIX}{pk}" for pk in option_ids])
+    return {pk: int(count) for pk, count in zip(option_ids, counts) if count}
+
+
+def apply_pending_votes(poll):
+    """
+    Add unflushed votes to a poll's prefetched options and vote total.
+
+    Annotated percentages are dropped so the serializer recomputes them from
+    the adjusted counts.
+    """
+    client = get_vote_buffer()
+    if client is None:
+        return
+    options = poll.options.all()
+    pending = pending_vote_counts(client, (option.id for option in options))
+    if not pending:
+        return
+    for option in options:
+        option.vote_count += pending.get(option.id, 0)
+        option.percentage = None
+    poll._total_votes = sum(option.vote_count for option in options)
+
+
+def flush_vote_counts(client):
+    """
+    Move buffered votes into PollOption.vote_count; returns the votes moved.
+
+    The counters are read with MGET and all the deltas are applied by a
+    single UPDATE ... CASE statement. Only after it has succeeded are the
+    applied counts taken off the counters (counters that reach zero are
+    deleted), so votes arriving meanwhile stay for the next flush and a
+    failed UPDATE loses nothing. A worker dying between the UPDATE and the
+    DECRBY makes the next flush apply those votes again. Returns 0 without
+    doing anything if another worker is already flushing.
+    """
+    lock = client.lock(VOTE_COUNTS_LOCK_KEY, timeout=VOTE_COUNTS_LOCK_TIMEOUT)
+    if not lock.acquire(blocking=False):
+        return 0
+    try:
+        return _flush_deltas(client)
+    finally:
+        lock.release()
+
+
+def _flush_deltas(client):
+    """Apply and settle the buffered counters; the caller holds the lock."""
+    keys = list(client.scan_iter(match=f"{VOTE_DELTA_PREFIX}*"))
+    if not keys:
+        return 0
+
+    deltas = {}
+    for key, count in zip(keys, client.mget(keys)):
+        if count and int(count):
+            if isinstance(key, bytes):
+                key = key.decode()
+            deltas[int(key[len(VOTE_DELTA_PREFIX) :])] = int(count)
+    if not deltas:
+        return 0
+
+    increment = Case(
+        *[When(pk=pk, then=Value(delta)) for pk, delta in deltas.items()],
+        default=Value(0),
+        output_field=IntegerField(),
+    )
+    PollOption.objects.filter(pk__in=deltas).update(
+        vote_count=F("vote_count") + increment
+    )
+
+    _get_settle_deltas_script(client)(
+        keys=[f"{VOTE_DELTA_PREFIX}{pk}" for pk in deltas],
+        args=list(deltas.values()),
+    )
+    return sum(deltas.values())
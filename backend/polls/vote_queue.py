@@ -0,0 +1,133 @@
+"""
+Vote rows queued in Redis and written to the database by Celery.
+
+When DEFER_VOTE_WRITES is on and the default cache is Redis, the vote request
+only claims the voter's cache marker and counts the vote; the Vote row itself
+is pushed onto a Redis list and the flush_vote_queue Celery task inserts the
+queued rows with one bulk INSERT per batch.
+"""
+
+import json
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.dateparse import parse_datetime
+
+from .models import PollOption, Vote
+from .ratelimit import get_redis_client
+
+VOTE_QUEUE_KEY = "vote-queue"
+
+# Batch being inserted; it only leaves Redis once the INSERT has committed
+VOTE_QUEUE_PROCESSING_KEY = "vote-queue:processing"
+
+# Held while flushing so only one worker owns the processing list
+VOTE_QUEUE_LOCK_KEY = "vote-queue:lock"
+VOTE_QUEUE_LOCK_TIMEOUT = 60
+
+# Votes inserted per bulk_create round-trip when flushing
+VOTE_QUEUE_BATCH_SIZE = 500
+
+# Move up to ARGV[1] votes from the head of the queue to the processing list.
+# KEYS[1] = queue, KEYS[2] = processing list
+# Returns the moved votes.
+TAKE_BATCH_LUA = """
+local items = redis.call('LRANGE', KEYS[1], 0, tonumber(ARGV[1]) - 1)
+if #items > 0 then
+    redis.call('RPUSH', KEYS[2], unpack(items))
+    redis.call('LTRIM', KEYS[1], #items, -1)
+end
+return items
+"""
+
+_take_batch_script = None
+
+
+def _get_take_batch_script(client):
+    """Register the batch script once; redis-py then calls it via EVALSHA."""
+    global _take_batch_script
+    if _take_batch_script is None:
+        _take_batch_script = client.register_script(TAKE_BATCH_LUA)
+    return _take_batch_script
+
+
+def get_vote_queue():
+    """Return the Redis client to queue vote rows in, or None if disabled."""
+    if not settings.DEFER_VOTE_WRITES:
+        return None
+    return get_redis_client()
+
+
+def queue_vote(client, vote):
+    """Queue an unsaved ``vote`` to be inserted later; returns it unchanged."""
+    client.rpush(
+        VOTE_QUEUE_KEY,
+        json.dumps(
+            [vote.poll_id, vote.option_id, vote.voter_ip, vote.voted_at.isoformat()]
+        ),
+    )
+    return vote
+
+
+def _insert_votes(items):
+    """
+    Insert queued votes, skipping rows the database would reject.
+
+    Votes whose option was deleted (or no longer belongs to the poll) since
+    they were queued are dropped, since one bad foreign key would fail the
+    whole INSERT. Rows that hit the (poll, voter_ip) constraint are skipped.
+    """
+    rows = [json.loads(item) for item in items]
+    live_options = set(
+        PollOption.objects.filter(pk__in={row[1] for row in rows}).values_list(
+            "id", "poll_id"
+        )
+    )
+    votes = [
+        Vote(
+            poll_id=poll_id,
+            option_id=option_id,
+            voter_ip=voter_ip,
+            voted_at=parse_datetime(voted_at),
+        )
+        for poll_id, option_id, voter_ip, voted_at in rows
+        if (option_id, poll_id) in live_options
+    ]
+    with transaction.atomic():
+        Vote.objects.bulk_create(votes, ignore_conflicts=True)
+
+
+def flush_vote_queue(client, batch_size=VOTE_QUEUE_BATCH_SIZE):
+    """
+    Insert queued votes into the database; returns the votes taken off the queue.
+
+    Each batch is moved atomically onto a processing list, inserted, and
+    only deleted from Redis after the INSERT commits. A batch left behind by
+    a failed or killed flush is retried first on the next run; re-inserting
+    it is harmless because conflicting rows are skipped. Returns 0 without
+    doing anything if another worker is already flushing.
+    """
+    lock = client.lock(VOTE_QUEUE_LOCK_KEY, timeout=VOTE_QUEUE_LOCK_TIMEOUT)
+    if not lock.acquire(blocking=False):
+        return 0
+    try:
+        flushed = 0
+        take_batch = _get_take_batch_script(client)
+        while True:
+            items = client.lrange(VOTE_QUEUE_PROCESSING_KEY, 0, -1)
+            retried = bool(items)
+            if not retried:
+                items = take_batch(
+                    keys=[VOTE_QUEUE_KEY, VOTE_QUEUE_PROCESSING_KEY],
+                    args=[batch_size],
+                )
+            if not items:
+                return flushed
+
+            _insert_votes(items)
+            client.delete(VOTE_QUEUE_PROCESSING_KEY)
+            flushed += len(items)
+            if not retried and len(items) < batch_size:
+                return flushed
+    finally:
+        lock.release()
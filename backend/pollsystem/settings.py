@@ -54,9 +54,11 @@ INSTALLED_APPS = [
     "polls",
 ]
 
-# Add django_ratelimit only if not running tests
-if "test" not in sys.argv:
-    INSTALLED_APPS.append("django_ratelimit")
+# Leave out drf_yasg and the API docs routes, e.g. on production workers, so
+# processes start without importing the schema generator
+DISABLE_SWAGGER = config("DISABLE_SWAGGER", default=False, cast=bool)
+if DISABLE_SWAGGER:
+    INSTALLED_APPS.remove("drf_yasg")
 
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
@@ -169,8 +171,7 @@ REST_FRAMEWORK = {
         "rest_framework.filters.OrderingFilter",
     ],
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle",
+        "polls.ratelimit.BucketedRateThrottle",
     ],
     "DEFAULT_THROTTLE_RATES": {
         "anon": "100/hour",
@@ -232,11 +233,6 @@ SIMPLE_JWT = {
     "SLIDING_TOKEN_REFRESH_LIFETIME": timedelta(days=7),
 }
 
-# Rate Limiting Configuration (only for non-test environments)
-if "test" not in sys.argv:
-    RATELIMIT_USE_CACHE = "default"
-    RATELIMIT_ENABLE = True
-
 # Cache Configuration
 if "test" in sys.argv:
     # Use local memory cache for testing
@@ -245,6 +241,19 @@ if "test" in sys.argv:
             "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
         }
     }
+    # Test users only need a cheap throwaway hash
+    PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+    # Build the test database straight from the models instead of replaying
+    # every migration; set TEST_MIGRATE=True to exercise the migrations
+    DATABASES["default"]["TEST"] = {
+        "MIGRATE": config("TEST_MIGRATE", default=False, cast=bool),
+    }
+    # Fail any test whose request lazily loads a relation per row
+    # (requires `pip install nplusone`)
+    if config("NPLUSONE", default=False, cast=bool):
+        INSTALLED_APPS.append("nplusone.ext.django")
+        MIDDLEWARE.insert(0, "nplusone.ext.django.NPlusOneMiddleware")
+        NPLUSONE_RAISE = True
 else:
     CACHES = {
         "default": {
@@ -256,6 +265,47 @@ else:
         }
     }
 
+# Count votes in Redis and let the Celery beat flush task write them to
+# PollOption.vote_count in batches (requires the Redis cache)
+BUFFER_VOTE_COUNTS = config("BUFFER_VOTE_COUNTS", default=False, cast=bool)
+
+# Queue Vote rows in Redis and let the Celery beat flush task insert them in
+# batches, so vote requests skip the INSERT (requires the Redis cache).
+# Repeat votes are only turned away by the voter's cache marker here: if the
+# marker is evicted early, a repeat vote is counted but its row is dropped by
+# the unique constraint at flush time, so vote_count can drift above the
+# number of Vote rows.
+DEFER_VOTE_WRITES = config("DEFER_VOTE_WRITES", default=False, cast=bool)
+
+# Celery Configuration, read by pollsystem/celery.py via the CELERY_ namespace
+CELERY_BROKER_URL = config("CELERY_BROKER_URL", default="redis://localhost:6379/0")
+CELERY_RESULT_BACKEND = config(
+    "CELERY_RESULT_BACKEND", default="redis://localhost:6379/0"
+)
+CELERY_BROKER_CONNECTION_RETRY_ON_STARTUP = True
+# Connections each web worker keeps open for sending tasks
+CELERY_BROKER_POOL_LIMIT = config("CELERY_BROKER_POOL_LIMIT", default=10, cast=int)
+CELERY_TASK_SERIALIZER = "json"
+CELERY_ACCEPT_CONTENT = ["json"]
+CELERY_RESULT_SERIALIZER = "json"
+CELERY_TIMEZONE = "UTC"
+CELERY_ENABLE_UTC = True
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
+CELERY_TASK_ACKS_LATE = True
+CELERY_TASK_REJECT_ON_WORKER_LOST = True
+# The flush tasks are only scheduled when the feature they drain is enabled
+CELERY_BEAT_SCHEDULE = {}
+if BUFFER_VOTE_COUNTS:
+    CELERY_BEAT_SCHEDULE["flush-vote-counts"] = {
+        "task": "polls.tasks.flush_vote_count_buffer",
+        "schedule": config("VOTE_COUNT_FLUSH_INTERVAL", default=2.0, cast=float),
+    }
+if DEFER_VOTE_WRITES:
+    CELERY_BEAT_SCHEDULE["flush-vote-queue"] = {
+        "task": "polls.tasks.flush_vote_queue_to_db",
+        "schedule": config("VOTE_QUEUE_FLUSH_INTERVAL", default=2.0, cast=float),
+    }
+
 # Authentication URLs
 LOGIN_REDIRECT_URL = "/polls/"
 LOGOUT_REDIRECT_URL = "/polls/"
@@ -20,53 +20,69 @@ from django.conf.urls.static import static
 from django.contrib import admin
 from django.contrib.auth import views as auth_views
 from django.urls import include, path
-from drf_yasg import openapi
-from drf_yasg.views import get_schema_view
 from rest_framework import permissions
 from rest_framework_simplejwt.views import (TokenObtainPairView,
                                             TokenRefreshView, TokenVerifyView)
 
 from polls.auth_views import register
 
-# Swagger/OpenAPI Schema
-schema_view = get_schema_view(
-    openapi.Info(
-        title="Online Poll System API",
-        default_version="v1",
-        description="A comprehensive API for managing online polls and voting",
-        terms_of_service="https://www.google.com/policies/terms/",
-        contact=openapi.Contact(email="contact@pollsystem.com"),
-        license=openapi.License(name="MIT License"),
-    ),
-    public=True,
-    permission_classes=(permissions.AllowAny,),
-)
+# View callables are built once here and shared by the routes that use them
+token_obtain_pair_view = TokenObtainPairView.as_view()
+token_refresh_view = TokenRefreshView.as_view()
+token_verify_view = TokenVerifyView.as_view()
+login_view = auth_views.LoginView.as_view()
+logout_view = auth_views.LogoutView.as_view()
+
+# JWT Authentication endpoints
+auth_urlpatterns = [
+    path("token/", token_obtain_pair_view, name="token_obtain_pair"),
+    path("login/", token_obtain_pair_view, name="api_login"),  # Alias for tests
+    path("register/", register, name="api_register"),  # API registration
+    path("token/refresh/", token_refresh_view, name="token_refresh"),
+    path("token/verify/", token_verify_view, name="token_verify"),
+]
+
+# API Documentation, left out entirely when DISABLE_SWAGGER is set
+docs_urlpatterns = []
+if not getattr(settings, "DISABLE_SWAGGER", False):
+    from drf_yasg import openapi
+    from drf_yasg.views import get_schema_view
+
+    # Swagger/OpenAPI Schema
+    schema_view = get_schema_view(
+        openapi.Info(
+            title="Online Poll System API",
+            default_version="v1",
+            description="A comprehensive API for managing online polls and voting",
+            terms_of_service="https://www.google.com/policies/terms/",
+            contact=openapi.Contact(email="contact@pollsystem.com"),
+            license=openapi.License(name="MIT License"),
+        ),
+        public=True,
+        permission_classes=(permissions.AllowAny,),
+    )
+
+    docs_urlpatterns += [
+        path(
+            "docs/",
+            schema_view.with_ui("swagger", cache_timeout=0),
+            name="schema-swagger-ui",
+        ),
+        path(
+            "redoc/", schema_view.with_ui("redoc", cache_timeout=0), name="schema-redoc"
+        ),
+        path("schema/", schema_view.without_ui(cache_timeout=0), name="schema-json"),
+    ]
 
 urlpatterns = [
     path("admin/", admin.site.urls),
-    # JWT Authentication endpoints
-    path("api/auth/token/", TokenObtainPairView.as_view(), name="token_obtain_pair"),
-    path(
-        "api/auth/login/", TokenObtainPairView.as_view(), name="api_login"
-    ),  # Alias for tests
-    path("api/auth/register/", register, name="api_register"),  # API registration
-    path("api/auth/token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
-    path("api/auth/token/verify/", TokenVerifyView.as_view(), name="token_verify"),
-    # API Documentation
-    path(
-        "api/docs/",
-        schema_view.with_ui("swagger", cache_timeout=0),
-        name="schema-swagger-ui",
-    ),
-    path(
-        "api/redoc/", schema_view.with_ui("redoc", cache_timeout=0), name="schema-redoc"
-    ),
-    path("api/schema/", schema_view.without_ui(cache_timeout=0), name="schema-json"),
+    path("api/auth/", include(auth_urlpatterns)),
+    path("api/", include(docs_urlpatterns)),
     # Include polls app URLs with namespace for named reverse lookups
     path("", include(("polls.urls", "polls"), namespace="polls")),
     # Global login/logout/register endpoints for Django views
-    path("login/", auth_views.LoginView.as_view(), name="login"),
-    path("logout/", auth_views.LogoutView.as_view(), name="logout"),
+    path("login/", login_view, name="login"),
+    path("logout/", logout_view, name="logout"),
     path("register/", register, name="register"),
 ]
 
@@ -3,11 +3,12 @@ API Tests for the ALX Project Nexus - Online Poll System
 """
 
 from django.test import TestCase
-from django.contrib.auth.models import User
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.cache import cache
 from django.urls import reverse
 from django.utils import timezone
 from datetime import timedelta
-from rest_framework.test import APITestCase, APIClient
+from rest_framework.test import APIRequestFactory, APITestCase
 from rest_framework import status
 import json
 
@@ -16,22 +17,25 @@ import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
 
+from polls import cache_keys, views
 from polls.models import Poll, PollOption, Vote
+from polls.serializers import PollResultSerializer, PollSerializer
+from polls.utils import client_ip
 
 
 class PollAPITest(APITestCase):
     """Test cases for Poll API endpoints"""
     
-    def setUp(self):
-        """Set up test data"""
-        self.client = APIClient()
-        self.user = User.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data shared by every test in the class"""
+        cls.user = User.objects.create_user(
             username='testuser',
             email='test@example.com',
             password='testpass123'
         )
         
-        self.poll_data = {
+        cls.poll_data = {
             'title': 'Test Poll',
             'description': 'Test Description',
             'expires_at': (timezone.now() + timedelta(hours=24)).isoformat(),
@@ -55,6 +59,11 @@ class PollAPITest(APITestCase):
         response = self.client.post('/api/polls/', self.poll_data, format='json')
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
         
+    def test_list_polls_json_suffix(self):
+        """Test the router keeps its .json format suffix routes"""
+        response = self.client.get('/api/polls.json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        
     def test_list_polls(self):
         """Test listing polls"""
         poll1 = Poll.objects.create(
@@ -93,7 +102,92 @@ class PollAPITest(APITestCase):
         response = self.client.get(f'/api/polls/{poll.id}/')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['title'], 'Test Poll')
-        
+
+    def test_list_polls_matches_detail_representation(self):
+        """Test list entries have the same shape as the poll detail"""
+        poll = Poll.objects.create(
+            title="Test Poll",
+            description="Test Description",
+            created_by=self.user,
+            expires_at=timezone.now() + timedelta(hours=24)
+        )
+        PollOption.objects.create(poll=poll, text="Option 1", vote_count=1)
+
+        list_response = self.client.get('/api/polls/?full=1')
+        detail_response = self.client.get(f'/api/polls/{poll.id}/')
+
+        self.assertEqual(
+            json.loads(json.dumps(list_response.data['results'][0])),
+            json.loads(json.dumps(detail_response.data))
+        )
+
+    def test_list_polls_omits_description(self):
+        """Test list entries leave out the description unless full=1"""
+        Poll.objects.create(
+            title="Test Poll",
+            description="Test Description",
+            created_by=self.user,
+            expires_at=timezone.now() + timedelta(hours=24)
+        )
+
+        response = self.client.get('/api/polls/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        entry = response.data['results'][0]
+        self.assertNotIn('description', entry)
+        self.assertEqual(entry['title'], "Test Poll")
+        self.assertEqual(entry['created_by']['username'], self.user.username)
+
+    def test_serializer_fields_not_shared(self):
+        """Test serializers built from cached fields never share field objects"""
+        first = PollSerializer().fields
+        second = PollSerializer().fields
+        self.assertEqual(list(first), list(second))
+        self.assertIsNot(first['title'], second['title'])
+        self.assertIsNot(first['options'].child, second['options'].child)
+        self.assertIs(first['options'].child.root, first['options'].root)
+
+    def test_list_polls_filtered_by_expiry(self):
+        """Test the expired query parameter filters polls in the database"""
+        open_poll = Poll.objects.create(
+            title="Open Poll",
+            created_by=self.user,
+            expires_at=timezone.now() + timedelta(hours=24)
+        )
+        expired_poll = Poll.objects.create(
+            title="Expired Poll",
+            created_by=self.user,
+            expires_at=timezone.now() - timedelta(hours=1)
+        )
+
+        response = self.client.get('/api/polls/?expired=0')
+        self.assertEqual(
+            [poll['id'] for poll in response.data['results']], [open_poll.id]
+        )
+        self.assertFalse(response.data['results'][0]['is_expired'])
+
+        response = self.client.get('/api/polls/?expired=1')
+        self.assertEqual(
+            [poll['id'] for poll in response.data['results']], [expired_poll.id]
+        )
+        self.assertTrue(response.data['results'][0]['is_expired'])
+
+    def test_poll_detail_total_votes(self):
+        """Test poll detail reports the summed option vote counts"""
+        poll = Poll.objects.create(
+            title="Test Poll",
+            description="Test Description",
+            created_by=self.user,
+            expires_at=timezone.now() + timedelta(hours=24)
+        )
+        PollOption.objects.bulk_create([
+            PollOption(poll=poll, text="Option 1", vote_count=3),
+            PollOption(poll=poll, text="Option 2", vote_count=2),
+        ])
+
+        response = self.client.get(f'/api/polls/{poll.id}/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['total_votes'], 5)
+
     def test_update_poll_owner(self):
         """Test updating poll by owner"""
         poll = Poll.objects.create(
@@ -155,19 +249,19 @@ class PollAPITest(APITestCase):
 class PollOptionAPITest(APITestCase):
     """Test cases for PollOption API endpoints"""
     
-    def setUp(self):
-        """Set up test data"""
-        self.client = APIClient()
-        self.user = User.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data shared by every test in the class"""
+        cls.user = User.objects.create_user(
             username='testuser',
             email='test@example.com',
             password='testpass123'
         )
         
-        self.poll = Poll.objects.create(
+        cls.poll = Poll.objects.create(
             title="Test Poll",
             description="Test Description",
-            created_by=self.user,
+            created_by=cls.user,
             expires_at=timezone.now() + timedelta(hours=24)
         )
         
@@ -185,8 +279,10 @@ class PollOptionAPITest(APITestCase):
         
     def test_list_poll_options(self):
         """Test listing poll options for a poll"""
-        option1 = PollOption.objects.create(poll=self.poll, text="Option 1")
-        option2 = PollOption.objects.create(poll=self.poll, text="Option 2")
+        PollOption.objects.bulk_create([
+            PollOption(poll=self.poll, text="Option 1"),
+            PollOption(poll=self.poll, text="Option 2"),
+        ])
         
         response = self.client.get(f'/api/polls/{self.poll.id}/options/')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -225,24 +321,31 @@ class PollOptionAPITest(APITestCase):
 class VoteAPITest(APITestCase):
     """Test cases for Vote API endpoints"""
     
-    def setUp(self):
-        """Set up test data"""
-        self.client = APIClient()
-        self.user = User.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data shared by every test in the class"""
+        cls.user = User.objects.create_user(
             username='testuser',
             email='test@example.com',
             password='testpass123'
         )
         
-        self.poll = Poll.objects.create(
+        cls.poll = Poll.objects.create(
             title="Test Poll",
             description="Test Description",
-            created_by=self.user,
+            created_by=cls.user,
             expires_at=timezone.now() + timedelta(hours=24)
         )
         
-        self.option1 = PollOption.objects.create(poll=self.poll, text="Option 1")
-        self.option2 = PollOption.objects.create(poll=self.poll, text="Option 2")
+        cls.option1, cls.option2 = PollOption.objects.bulk_create([
+            PollOption(poll=cls.poll, text="Option 1"),
+            PollOption(poll=cls.poll, text="Option 2"),
+        ])
+        
+    def setUp(self):
+        """Forget cached votes and poll details left by earlier tests"""
+        cache.clear()
+        views._poll_meta_cache.clear()
         
     def test_cast_vote(self):
         """Test casting a vote"""
@@ -270,7 +373,124 @@ class VoteAPITest(APITestCase):
         response2 = self.client.post('/api/votes/', vote_data, format='json')
         self.assertEqual(response2.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertEqual(Vote.objects.count(), 1)
-        
+
+    def test_vote_uses_first_forwarded_ip(self):
+        """Test that the first X-Forwarded-For hop is stored as the voter IP"""
+        vote_data = {
+            'poll': self.poll.id,
+            'option': self.option1.id
+        }
+
+        response = self.client.post(
+            '/api/votes/', vote_data, format='json',
+            HTTP_X_FORWARDED_FOR='10.0.0.1, 10.0.0.2'
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Vote.objects.get().voter_ip, '10.0.0.1')
+
+    def test_vote_ignores_malformed_forwarded_ip(self):
+        """Test a malformed X-Forwarded-For falls back to the connection address"""
+        vote_data = {
+            'poll': self.poll.id,
+            'option': self.option1.id
+        }
+
+        response = self.client.post(
+            '/api/votes/', vote_data, format='json',
+            HTTP_X_FORWARDED_FOR='not-an-ip, 10.0.0.2'
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Vote.objects.get().voter_ip, '127.0.0.1')
+
+    def test_client_ip_resolved_once_per_request(self):
+        """Test the resolved client IP is memoized in the request's META"""
+        meta = {'HTTP_X_FORWARDED_FOR': '10.0.0.1, 10.0.0.2'}
+        self.assertEqual(client_ip(meta), '10.0.0.1')
+        meta['HTTP_X_FORWARDED_FOR'] = '10.9.9.9'
+        self.assertEqual(client_ip(meta), '10.0.0.1')
+
+    def test_vote_option_from_other_poll(self):
+        """Test that voting with an option from another poll is rejected"""
+        other_poll = Poll.objects.create(
+            title="Other Poll",
+            description="Test Description",
+            created_by=self.user,
+            expires_at=timezone.now() + timedelta(hours=24)
+        )
+        other_option = PollOption.objects.create(poll=other_poll, text="Option 1")
+
+        vote_data = {
+            'poll': self.poll.id,
+            'option': other_option.id
+        }
+
+        response = self.client.post('/api/votes/', vote_data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Vote.objects.count(), 0)
+
+    def test_duplicate_vote_via_poll_vote_action(self):
+        """Test that the poll vote action rejects a second vote from the same IP"""
+        url = f'/api/polls/{self.poll.id}/vote/'
+
+        response1 = self.client.post(url, {'option_id': self.option1.id}, format='json')
+        self.assertEqual(response1.status_code, status.HTTP_200_OK)
+
+        response2 = self.client.post(url, {'option_id': self.option2.id}, format='json')
+        self.assertEqual(response2.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response2.data['code'], 'DUPLICATE_VOTE')
+
+        self.option1.refresh_from_db()
+        self.option2.refresh_from_db()
+        self.assertEqual(self.option1.vote_count, 1)
+        self.assertEqual(self.option2.vote_count, 0)
+
+    def test_duplicate_vote_rejected_by_cache_and_database(self):
+        """Test repeat voters are stopped by the cache, then by the database"""
+        url = f'/api/polls/{self.poll.id}/vote/'
+        self.client.post(url, {'option_id': self.option1.id}, format='json')
+
+        # The cache marker alone turns the voter away
+        Vote.objects.all().delete()
+        response = self.client.post(url, {'option_id': self.option1.id}, format='json')
+        self.assertEqual(response.data['code'], 'DUPLICATE_VOTE')
+        self.assertEqual(Vote.objects.count(), 0)
+
+        # Without the marker, the unique constraint still rejects the repeat
+        Vote.objects.create(poll=self.poll, option=self.option1, voter_ip='127.0.0.1')
+        cache.clear()
+        response = self.client.post(url, {'option_id': self.option2.id}, format='json')
+        self.assertEqual(response.data['code'], 'DUPLICATE_VOTE')
+        self.assertEqual(Vote.objects.count(), 1)
+
+    def test_vote_response_includes_option_count(self):
+        """Test a successful vote returns the option's updated vote count"""
+        self.option1.vote_count = 4
+        self.option1.save()
+
+        response = self.client.post(
+            f'/api/polls/{self.poll.id}/vote/',
+            {'option_id': self.option1.id},
+            format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['vote_count'], 5)
+
+    def test_vote_sees_poll_expiry_change(self):
+        """Test cached poll details are dropped when the poll is saved"""
+        url = f'/api/polls/{self.poll.id}/vote/'
+        response = self.client.post(url, {'option_id': self.option1.id}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.poll.expires_at = timezone.now() - timedelta(hours=1)
+        self.poll.save()
+
+        response = self.client.post(
+            url, {'option_id': self.option1.id}, format='json',
+            REMOTE_ADDR='192.168.1.50'
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['code'], 'POLL_INACTIVE')
+
     def test_vote_on_expired_poll(self):
         """Test voting on expired poll"""
         expired_poll = Poll.objects.create(
@@ -293,23 +513,147 @@ class VoteAPITest(APITestCase):
     def test_get_poll_results(self):
         """Test getting poll results"""
         # Create some votes
-        Vote.objects.create(poll=self.poll, option=self.option1, voter_ip="192.168.1.1")
-        Vote.objects.create(poll=self.poll, option=self.option1, voter_ip="192.168.1.2")
-        Vote.objects.create(poll=self.poll, option=self.option2, voter_ip="192.168.1.3")
+        Vote.objects.bulk_create([
+            Vote(poll=self.poll, option=self.option1, voter_ip="192.168.1.1"),
+            Vote(poll=self.poll, option=self.option1, voter_ip="192.168.1.2"),
+            Vote(poll=self.poll, option=self.option2, voter_ip="192.168.1.3"),
+        ])
         
         response = self.client.get(f'/api/polls/{self.poll.id}/results/')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         
         # Should contain vote counts
         self.assertIn('results', response.data)
-        
+
+    def test_poll_results_match_serializer(self):
+        """Test the results endpoint renders exactly what PollResultSerializer does"""
+        for ip, option in (('10.0.0.1', self.option1), ('10.0.0.2', self.option1),
+                           ('10.0.0.3', self.option2)):
+            self.client.post(
+                f'/api/polls/{self.poll.id}/vote/',
+                {'option_id': option.id},
+                format='json',
+                REMOTE_ADDR=ip
+            )
+
+        response = self.client.get(f'/api/polls/{self.poll.id}/results/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        expected = PollResultSerializer(Poll.objects.get(pk=self.poll.pk)).data
+        self.assertEqual(json.loads(response.content), json.loads(json.dumps(expected)))
+        self.assertEqual(response.data['total_votes'], 3)
+
+    def test_poll_results_query_count(self):
+        """Test results load the poll and its options in two queries, however many options"""
+        PollOption.objects.bulk_create([
+            PollOption(poll=self.poll, text=f"Extra {i}", vote_count=i)
+            for i in range(10)
+        ])
+
+        with self.assertNumQueries(2):
+            response = self.client.get(f'/api/polls/{self.poll.id}/results/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['options']), 12)
+        self.assertEqual(response.data['total_votes'], 45)
+
+    def test_poll_results_refresh_after_vote(self):
+        """Test cached poll results are invalidated when a vote is cast"""
+        url = f'/api/polls/{self.poll.id}/results/'
+
+        response = self.client.get(url)
+        self.assertEqual(response.data['total_votes'], 0)
+
+        self.client.post(
+            f'/api/polls/{self.poll.id}/vote/',
+            {'option_id': self.option1.id},
+            format='json'
+        )
+
+        response = self.client.get(url)
+        self.assertEqual(response.data['total_votes'], 1)
+
+    def test_poll_results_rebuilt_by_one_request(self):
+        """Test results are served stale while another request rebuilds them"""
+        url = f'/api/polls/{self.poll.id}/results/'
+        self.client.get(url)
+        self.client.post(
+            f'/api/polls/{self.poll.id}/vote/',
+            {'option_id': self.option1.id},
+            format='json'
+        )
+
+        lock_key = f"{cache_keys.results_cache_keys(self.poll.id)[0]}:lock"
+        cache.add(lock_key, True)
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertEqual(response.data['total_votes'], 0)
+
+        cache.delete(lock_key)
+        response = self.client.get(url)
+        self.assertEqual(response.data['total_votes'], 1)
+
+    def test_poll_list_not_modified(self):
+        """Test the poll list honours If-None-Match until a vote changes it"""
+        response = self.client.get('/api/polls/')
+        etag = response['ETag']
+
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/polls/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        response = self.client.get('/api/polls/?expired=0', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.client.post(
+            f'/api/polls/{self.poll.id}/vote/',
+            {'option_id': self.option1.id},
+            format='json'
+        )
+
+        response = self.client.get('/api/polls/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'][0]['total_votes'], 1)
+
+    def test_poll_results_not_modified(self):
+        """Test poll results honour If-None-Match until a vote changes them"""
+        url = f'/api/polls/{self.poll.id}/results/'
+
+        response = self.client.get(url)
+        etag = response['ETag']
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.client.post(
+            f'/api/polls/{self.poll.id}/vote/',
+            {'option_id': self.option1.id},
+            format='json'
+        )
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_poll_results_percentages(self):
+        """Test poll results report per-option percentages"""
+        PollOption.objects.filter(pk=self.option1.pk).update(vote_count=3)
+        PollOption.objects.filter(pk=self.option2.pk).update(vote_count=1)
+
+        response = self.client.get(f'/api/polls/{self.poll.id}/results/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        percentages = {
+            option['id']: option['percentage'] for option in response.data['options']
+        }
+        self.assertEqual(response.data['total_votes'], 4)
+        self.assertEqual(percentages[self.option1.id], 75.0)
+        self.assertEqual(percentages[self.option2.id], 25.0)
+
 
 class AuthenticationAPITest(APITestCase):
     """Test API authentication"""
     
     def setUp(self):
         """Set up test data"""
-        self.client = APIClient()
         self.user_data = {
             'username': 'testuser',
             'email': 'test@example.com',
@@ -321,7 +665,30 @@ class AuthenticationAPITest(APITestCase):
         response = self.client.post('/api/auth/register/', self.user_data, format='json')
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertTrue(User.objects.filter(username='testuser').exists())
-        
+
+    def test_user_registration_root_route(self):
+        """Test registration through the root register/ route"""
+        response = self.client.post('/register/', self.user_data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_user_registration_duplicate_username(self):
+        """Test registration with an existing username"""
+        User.objects.create_user(**self.user_data)
+        data = dict(self.user_data, email='other@example.com')
+
+        response = self.client.post('/api/auth/register/', data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['error'], 'Username already exists')
+
+    def test_user_registration_duplicate_email(self):
+        """Test registration with an existing email"""
+        User.objects.create_user(**self.user_data)
+        data = dict(self.user_data, username='otheruser')
+
+        response = self.client.post('/api/auth/register/', data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['error'], 'Email already exists')
+
     def test_user_login(self):
         """Test user login via API"""
         user = User.objects.create_user(**self.user_data)
@@ -334,7 +701,21 @@ class AuthenticationAPITest(APITestCase):
         response = self.client.post('/api/auth/token/', login_data, format='json')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIn('access', response.data)
-        
+
+    def test_repeated_login_issues_new_token_pair(self):
+        """Test that every login gets its own token pair"""
+        User.objects.create_user(**self.user_data)
+        login_data = {
+            'username': 'testuser',
+            'password': 'testpass123'
+        }
+
+        response1 = self.client.post('/api/auth/token/', login_data, format='json')
+        response2 = self.client.post('/api/auth/token/', login_data, format='json')
+        self.assertEqual(response1.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response1.data['access'], response2.data['access'])
+        self.assertNotEqual(response1.data['refresh'], response2.data['refresh'])
+
     def test_jwt_token_authentication(self):
         """Test JWT token authentication"""
         user = User.objects.create_user(**self.user_data)
@@ -368,10 +749,6 @@ class AuthenticationAPITest(APITestCase):
 class RateLimitingAPITest(APITestCase):
     """Test API rate limiting"""
     
-    def setUp(self):
-        """Set up test data"""
-        self.client = APIClient()
-        
     def test_rate_limiting_on_vote_endpoint(self):
         """Test rate limiting on vote endpoint"""
         # This would test the actual rate limiting implementation
@@ -383,18 +760,50 @@ class RateLimitingAPITest(APITestCase):
         # Test that users can't create too many polls too quickly
         pass
 
+    def test_default_throttle_scope_follows_authentication(self):
+        """Test the default throttle counts anonymous and logged-in clients separately"""
+        user = User.objects.create_user(username='throttled', password='testpass123')
+        request = APIRequestFactory().get('/api/polls/', REMOTE_ADDR='10.0.0.1')
+        request.user = AnonymousUser()
+        throttle = views.BucketedRateThrottle()
+        self.assertTrue(throttle.allow_request(request, None))
+        self.assertEqual(throttle.scope, 'anon')
+        self.assertEqual(throttle.key, 'throttle_anon_10.0.0.1')
+
+        request.user = user
+        throttle = views.BucketedRateThrottle()
+        self.assertTrue(throttle.allow_request(request, None))
+        self.assertEqual(throttle.scope, 'user')
+        self.assertEqual(throttle.key, f'throttle_user_{user.pk}')
+
+    def test_throttles_key_on_voter_ip(self):
+        """Test that throttles identify clients by the stored voter IP"""
+        request = APIRequestFactory().post(
+            '/api/polls/1/vote/',
+            HTTP_X_FORWARDED_FOR='10.0.0.1, 10.0.0.2',
+        )
+        for throttle_class in (
+            views.VotingRateThrottle,
+            views.PollCreationRateThrottle,
+            *views.DEFAULT_THROTTLE_CLASSES,
+        ):
+            self.assertEqual(throttle_class().get_ident(request), '10.0.0.1')
+
 
 class DataValidationAPITest(APITestCase):
     """Test API data validation"""
     
-    def setUp(self):
-        """Set up test data"""
-        self.client = APIClient()
-        self.user = User.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data shared by every test in the class"""
+        cls.user = User.objects.create_user(
             username='testuser',
             email='test@example.com',
             password='testpass123'
         )
+        
+    def setUp(self):
+        """Authenticate the test client"""
         self.client.force_authenticate(user=self.user)
         
     def test_poll_validation_empty_title(self):
@@ -74,6 +74,13 @@ class PollModelTest(TestCase):
         # Initially should have 0 votes
         self.assertEqual(poll.total_votes, 0)
 
+        PollOption.objects.create(poll=poll, text="Option 1", vote_count=2)
+        PollOption.objects.create(poll=poll, text="Option 2", vote_count=3)
+
+        # Summed in a single aggregate query
+        with self.assertNumQueries(1):
+            self.assertEqual(poll.total_votes, 5)
+
 
 class PollOptionModelTest(TestCase):
     """Test cases for PollOption model"""
@@ -182,6 +189,25 @@ class VoteModelTest(TestCase):
                 voter_ip="192.168.1.1"
             )
             
+    def test_record_vote_ignores_duplicates(self):
+        """Test recording a duplicate vote returns None instead of raising"""
+        vote = Vote.objects.record(self.poll.id, self.option.id, "192.168.1.1")
+        self.assertIsNotNone(vote.pk)
+        self.assertEqual(Vote.objects.get(pk=vote.pk).voter_ip, "192.168.1.1")
+
+        self.assertIsNone(Vote.objects.record(self.poll.id, self.option.id, "192.168.1.1"))
+        self.assertEqual(Vote.objects.filter(poll=self.poll).count(), 1)
+            
+    def test_cast_vote_counts_only_new_votes(self):
+        """Test casting a vote bumps the option count once per voter"""
+        vote = Vote.objects.cast(self.poll.id, self.option.id, "192.168.1.1")
+        self.assertIsNotNone(vote.pk)
+        self.assertEqual(vote.option_vote_count, 1)
+
+        self.assertIsNone(Vote.objects.cast(self.poll.id, self.option.id, "192.168.1.1"))
+        self.option.refresh_from_db()
+        self.assertEqual(self.option.vote_count, 1)
+            
     def test_multiple_votes_different_ips(self):
         """Test that multiple votes from different IPs are allowed"""
         vote1 = Vote.objects.create(
@@ -2,8 +2,9 @@
 Test views for the ALX Project Nexus - Online Poll System
 """
 
-from django.test import TestCase, Client
+from django.test import Client, RequestFactory, SimpleTestCase, TestCase
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.urls import reverse
 from django.utils import timezone
 from datetime import timedelta
@@ -14,137 +15,135 @@ import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
 
+from polls import views
 from polls.models import Poll, PollOption, Vote
 
+# Fixture expiry times, computed once when the module loads
+_FUTURE = timezone.now() + timedelta(hours=24)
+_PAST = timezone.now() - timedelta(hours=1)
+
+
+class PollFixtureMixin:
+    """Shared user, poll and two options for the poll view tests"""
+    
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data once per class"""
+        cls.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        
+        cls.poll = Poll.objects.create(
+            title="Test Poll",
+            description="Test Description",
+            created_by=cls.user,
+            expires_at=_FUTURE
+        )
+        
+        cls.option1, cls.option2 = PollOption.objects.bulk_create([
+            PollOption(poll=cls.poll, text="Option 1"),
+            PollOption(poll=cls.poll, text="Option 2"),
+        ])
+        
+        cls.detail_url = reverse('polls:detail', args=[cls.poll.id])
+        cls.vote_url = reverse('polls:vote', args=[cls.poll.id])
+        cls.results_url = reverse('polls:results', args=[cls.poll.id])
+
+
+class ViewStatusTest(PollFixtureMixin, TestCase):
+    """Test the status code of each read-only poll view"""
+    
+    def test_view_status_codes(self):
+        """Test that views are accessible and missing polls return 404"""
+        cases = [
+            (reverse('polls:index'), 200),
+            (self.detail_url, 200),
+            (reverse('polls:detail', args=[999]), 404),
+            (self.results_url, 200),
+            (reverse('polls:results', args=[999]), 404),
+        ]
+        for url, status in cases:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, status)
+
 
 class PollListViewTest(TestCase):
     """Test cases for poll list view"""
     
-    def setUp(self):
-        """Set up test data and client"""
-        self.client = Client()
-        self.user = User.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data"""
+        cls.user = User.objects.create_user(
             username='testuser',
             email='test@example.com',
             password='testpass123'
         )
         
         # Create test polls
-        self.active_poll = Poll.objects.create(
+        cls.active_poll = Poll.objects.create(
             title="Active Poll",
             description="An active poll",
-            created_by=self.user,
-            expires_at=timezone.now() + timedelta(hours=24)
+            created_by=cls.user,
+            expires_at=_FUTURE
         )
         
-        self.expired_poll = Poll.objects.create(
+        cls.expired_poll = Poll.objects.create(
             title="Expired Poll",
             description="An expired poll",
-            created_by=self.user,
-            expires_at=timezone.now() - timedelta(hours=1)
+            created_by=cls.user,
+            expires_at=_PAST
         )
         
-    def test_poll_list_view_accessible(self):
-        """Test that poll list view is accessible"""
-        response = self.client.get(reverse('polls:index'))
-        self.assertEqual(response.status_code, 200)
-        
     def test_poll_list_shows_active_polls(self):
         """Test that active polls are shown in list"""
-        response = self.client.get(reverse('polls:index'))
+        response = views.index(RequestFactory().get(reverse('polls:index')))
         self.assertContains(response, "Active Poll")
         
     def test_poll_list_context_data(self):
         """Test poll list view context data"""
-        response = self.client.get(reverse('polls:index'))
+        # One query for the page of polls
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('polls:index'))
         self.assertIn('latest_poll_list', response.context)
         polls = response.context['latest_poll_list']
         self.assertIn(self.active_poll, polls)
 
 
-class PollDetailViewTest(TestCase):
+class PollDetailViewTest(PollFixtureMixin, TestCase):
     """Test cases for poll detail view"""
     
-    def setUp(self):
-        """Set up test data"""
-        self.client = Client()
-        self.user = User.objects.create_user(
-            username='testuser',
-            email='test@example.com',
-            password='testpass123'
-        )
-        
-        self.poll = Poll.objects.create(
-            title="Test Poll",
-            description="Test Description",
-            created_by=self.user,
-            expires_at=timezone.now() + timedelta(hours=24)
-        )
-        
-        self.option1 = PollOption.objects.create(
-            poll=self.poll,
-            text="Option 1"
-        )
-        self.option2 = PollOption.objects.create(
-            poll=self.poll,
-            text="Option 2"
-        )
-        
-    def test_poll_detail_view_accessible(self):
-        """Test that poll detail view is accessible"""
-        response = self.client.get(reverse('polls:detail', args=[self.poll.id]))
-        self.assertEqual(response.status_code, 200)
-        
     def test_poll_detail_shows_poll_info(self):
         """Test that poll detail shows poll information"""
-        response = self.client.get(reverse('polls:detail', args=[self.poll.id]))
+        request = RequestFactory().get(self.detail_url)
+        response = views.detail(request, self.poll.id)
         self.assertContains(response, self.poll.title)
         self.assertContains(response, self.poll.description)
         
     def test_poll_detail_shows_options(self):
         """Test that poll detail shows poll options"""
-        response = self.client.get(reverse('polls:detail', args=[self.poll.id]))
+        # One query for the poll and one for its options
+        request = RequestFactory().get(self.detail_url)
+        with self.assertNumQueries(2):
+            response = views.detail(request, self.poll.id)
         self.assertContains(response, "Option 1")
         self.assertContains(response, "Option 2")
-        
-    def test_poll_detail_nonexistent_poll(self):
-        """Test accessing detail of non-existent poll"""
-        response = self.client.get(reverse('polls:detail', args=[999]))
-        self.assertEqual(response.status_code, 404)
 
 
-class VoteViewTest(TestCase):
+class VoteViewTest(PollFixtureMixin, TestCase):
     """Test cases for voting functionality"""
     
     def setUp(self):
-        """Set up test data"""
-        self.client = Client()
-        self.user = User.objects.create_user(
-            username='testuser',
-            email='test@example.com',
-            password='testpass123'
-        )
-        
-        self.poll = Poll.objects.create(
-            title="Test Poll",
-            description="Test Description",
-            created_by=self.user,
-            expires_at=timezone.now() + timedelta(hours=24)
-        )
-        
-        self.option1 = PollOption.objects.create(
-            poll=self.poll,
-            text="Option 1"
-        )
-        self.option2 = PollOption.objects.create(
-            poll=self.poll,
-            text="Option 2"
-        )
+        """Clear cached voter markers"""
+        # Voter markers are cached by poll id, which the database reuses
+        cache.clear()
         
     def test_successful_vote(self):
         """Test successful voting"""
         response = self.client.post(
-            reverse('polls:vote', args=[self.poll.id]),
+            self.vote_url,
             {'choice': self.option1.id}
         )
         
@@ -152,17 +151,15 @@ class VoteViewTest(TestCase):
         self.assertEqual(response.status_code, 302)
         
         # Verify vote was created
-        self.assertTrue(
-            Vote.objects.filter(
-                poll=self.poll,
-                option=self.option1
-            ).exists()
+        vote_options = list(
+            Vote.objects.filter(poll=self.poll).values_list('option_id', flat=True)
         )
+        self.assertEqual(vote_options, [self.option1.id])
         
     def test_vote_without_selection(self):
         """Test voting without selecting an option"""
         response = self.client.post(
-            reverse('polls:vote', args=[self.poll.id]),
+            self.vote_url,
             {}
         )
         
@@ -175,102 +172,122 @@ class VoteViewTest(TestCase):
     def test_vote_invalid_option(self):
         """Test voting with invalid option"""
         response = self.client.post(
-            reverse('polls:vote', args=[self.poll.id]),
+            self.vote_url,
             {'choice': 999}
         )
         
         # Should show error message (check for HTML-escaped version)
         self.assertContains(response, "You didn&#x27;t select a choice")
         
+    def test_invalid_option_does_not_block_vote(self):
+        """Test a rejected option leaves the voter free to vote again"""
+        self.client.post(
+            self.vote_url,
+            {'choice': 999}
+        )
+        response = self.client.post(
+            self.vote_url,
+            {'choice': self.option1.id}
+        )
+        
+        self.assertEqual(response.status_code, 302)
+        vote_options = list(
+            Vote.objects.filter(poll=self.poll).values_list('option_id', flat=True)
+        )
+        self.assertEqual(vote_options, [self.option1.id])
+        
+    def test_vote_on_missing_poll(self):
+        """Test voting on a poll that does not exist returns 404"""
+        response = self.client.post(
+            reverse('polls:vote', args=[9999]),
+            {'choice': self.option1.id}
+        )
+        
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(Vote.objects.count(), 0)
+        
     def test_duplicate_vote_prevention(self):
         """Test that duplicate votes are prevented"""
         # First vote
         self.client.post(
-            reverse('polls:vote', args=[self.poll.id]),
+            self.vote_url,
             {'choice': self.option1.id}
         )
         
         # Second vote from same IP
         response = self.client.post(
-            reverse('polls:vote', args=[self.poll.id]),
+            self.vote_url,
             {'choice': self.option2.id}
         )
         
         # Should show error or handle appropriately
-        # Only one vote should exist
-        self.assertEqual(Vote.objects.filter(poll=self.poll).count(), 1)
-
-
-class ResultsViewTest(TestCase):
-    """Test cases for poll results view"""
-    
-    def setUp(self):
-        """Set up test data"""
-        self.client = Client()
-        self.user = User.objects.create_user(
-            username='testuser',
-            email='test@example.com',
-            password='testpass123'
+        # Only the first vote should exist
+        vote_options = list(
+            Vote.objects.filter(poll=self.poll).values_list('option_id', flat=True)
         )
+        self.assertEqual(len(vote_options), 1)
+        self.assertEqual(vote_options[0], self.option1.id)
         
-        self.poll = Poll.objects.create(
-            title="Test Poll",
-            description="Test Description",
-            created_by=self.user,
-            expires_at=timezone.now() + timedelta(hours=24)
+    def test_vote_marker_uses_forwarded_client_ip(self):
+        """Test that the voter marker is keyed by the same client IP as the API"""
+        self.client.post(
+            self.vote_url,
+            {'choice': self.option1.id},
+            HTTP_X_FORWARDED_FOR='203.0.113.7, 10.0.0.1'
         )
         
-        self.option1 = PollOption.objects.create(
-            poll=self.poll,
-            text="Option 1"
-        )
-        self.option2 = PollOption.objects.create(
-            poll=self.poll,
-            text="Option 2"
+        self.assertTrue(cache.get(views.voted_key(self.poll.id, '203.0.113.7')))
+        self.assertEqual(
+            Vote.objects.get(poll=self.poll).voter_ip, '203.0.113.7'
         )
         
-        # Create some votes
-        Vote.objects.create(
-            poll=self.poll,
-            option=self.option1,
-            voter_ip="192.168.1.1"
-        )
-        Vote.objects.create(
-            poll=self.poll,
-            option=self.option1,
-            voter_ip="192.168.1.2"
+    def test_duplicate_vote_leaves_counts_unchanged(self):
+        """Test that a rejected duplicate vote does not bump any option count"""
+        self.client.post(
+            self.vote_url,
+            {'choice': self.option1.id}
         )
-        Vote.objects.create(
-            poll=self.poll,
-            option=self.option2,
-            voter_ip="192.168.1.3"
+        response = self.client.post(
+            self.vote_url,
+            {'choice': self.option2.id}
         )
         
-    def test_results_view_accessible(self):
-        """Test that results view is accessible"""
-        response = self.client.get(reverse('polls:results', args=[self.poll.id]))
-        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "You have already voted in this poll.")
+        self.option1.refresh_from_db()
+        self.option2.refresh_from_db()
+        self.assertEqual(self.option1.vote_count, 1)
+        self.assertEqual(self.option2.vote_count, 0)
+
+
+class ResultsViewTest(PollFixtureMixin, TestCase):
+    """Test cases for poll results view"""
+    
+    def setUp(self):
+        """Create some votes"""
+        Vote.objects.bulk_create([
+            Vote(poll=self.poll, option=self.option1, voter_ip="192.168.1.1"),
+            Vote(poll=self.poll, option=self.option1, voter_ip="192.168.1.2"),
+            Vote(poll=self.poll, option=self.option2, voter_ip="192.168.1.3"),
+        ])
         
     def test_results_shows_vote_counts(self):
         """Test that results show vote counts"""
-        response = self.client.get(reverse('polls:results', args=[self.poll.id]))
+        # One query for the poll and one for its options
+        request = RequestFactory().get(self.results_url)
+        with self.assertNumQueries(2):
+            response = views.results(request, self.poll.id)
         self.assertContains(response, "Option 1")
         self.assertContains(response, "Option 2")
         # Should show vote counts (2 for option1, 1 for option2)
-        
-    def test_results_nonexistent_poll(self):
-        """Test accessing results of non-existent poll"""
-        response = self.client.get(reverse('polls:results', args=[999]))
-        self.assertEqual(response.status_code, 404)
 
 
 class AuthenticationTest(TestCase):
     """Test authentication-related functionality"""
     
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """Set up test data"""
-        self.client = Client()
-        self.user = User.objects.create_user(
+        cls.user = User.objects.create_user(
             username='testuser',
             email='test@example.com',
             password='testpass123'
@@ -293,57 +310,60 @@ class AuthenticationTest(TestCase):
         
         # Should redirect after logout
         self.assertEqual(response.status_code, 302)
-        
-    def test_login_required_views(self):
-        """Test that login is required for protected views"""
-        # This test would depend on which views require authentication
-        pass
 
 
 class SecurityTest(TestCase):
     """Test security features"""
     
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """Set up test data"""
-        self.client = Client()
-        self.user = User.objects.create_user(
+        cls.user = User.objects.create_user(
             username='testuser',
             email='test@example.com',
             password='testpass123'
         )
         
-        self.poll = Poll.objects.create(
+        cls.poll = Poll.objects.create(
             title="Test Poll",
             description="Test Description",
-            created_by=self.user,
-            expires_at=timezone.now() + timedelta(hours=24)
+            created_by=cls.user,
+            expires_at=_FUTURE
         )
         
-    def test_csrf_protection(self):
-        """Test CSRF protection on forms"""
         # Create a client that enforces CSRF protection
-        from django.test.client import Client
-        csrf_client = Client(enforce_csrf_checks=True)
+        cls.csrf_client = Client(enforce_csrf_checks=True)
         
-        response = csrf_client.post(
+    def test_csrf_protection(self):
+        """Test CSRF protection on forms"""
+        response = self.csrf_client.post(
             reverse('polls:vote', args=[self.poll.id]),
             {'choice': 1}
         )
         # Should fail due to missing CSRF token
         self.assertEqual(response.status_code, 403)
         
-    def test_rate_limiting(self):
-        """Test rate limiting functionality"""
-        # This would test the rate limiting middleware
-        # Multiple rapid requests should be limited
-        pass
-        
     def test_sql_injection_protection(self):
         """Test protection against SQL injection"""
         # Django ORM provides protection, but we can test with malicious input
         malicious_input = "'; DROP TABLE polls_poll; --"
         response = self.client.get(f"/polls/search/?q={malicious_input}")
         # Should not cause any issues
+
+
+class PendingSecurityTest(SimpleTestCase):
+    """Placeholders for security checks that are not written yet"""
+    
+    def test_login_required_views(self):
+        """Test that login is required for protected views"""
+        # This test would depend on which views require authentication
+        pass
+        
+    def test_rate_limiting(self):
+        """Test rate limiting functionality"""
+        # This would test the rate limiting middleware
+        # Multiple rapid requests should be limited
+        pass
         
     def test_xss_protection(self):
         """Test protection against XSS attacks"""